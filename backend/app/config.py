@@ -8,6 +8,12 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     SESSION_IDLE_TIMEOUT_MINUTES: int = 30
+    SESSION_TOUCH_INTERVAL_SECONDS: int = 60
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT_SECONDS: int = 10
+    DB_STATEMENT_TIMEOUT_MS: int = 5000  # 0 disables the server-side limit
+    BCRYPT_ROUNDS: int = 10  # weaker stored hashes are upgraded on login; stronger ones are kept
     SMTP_HOST: str
     SMTP_PORT: int
     SMTP_USERNAME: str
@@ -7,7 +7,8 @@ from fastapi import WebSocket
 
 class AttendanceConnectionManager:
     def __init__(self):
-        self.active_connections: Dict[int, WebSocket] = {}
+        # A user can have several tabs or devices open; each gets its own socket.
+        self.active_connections: Dict[int, Dict[int, WebSocket]] = {}
         self.stream_connections: Dict[int, WebSocket] = {}
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._lock = Lock()
@@ -16,11 +17,16 @@ class AttendanceConnectionManager:
         await websocket.accept()
         self._loop = asyncio.get_running_loop()
         with self._lock:
-            self.active_connections[user_id] = websocket
+            self.active_connections.setdefault(user_id, {})[id(websocket)] = websocket
 
-    def disconnect(self, user_id: int):
+    def disconnect(self, user_id: int, websocket: WebSocket):
         with self._lock:
-            self.active_connections.pop(user_id, None)
+            sockets = self.active_connections.get(user_id)
+            if sockets is None:
+                return
+            sockets.pop(id(websocket), None)
+            if not sockets:
+                self.active_connections.pop(user_id, None)
 
     async def connect_stream(self, websocket: WebSocket):
         await websocket.accept()
@@ -32,14 +38,17 @@ class AttendanceConnectionManager:
         with self._lock:
             self.stream_connections.pop(id(websocket), None)
 
-    async def notify(self, user_id: int):
+    async def notify(self, user_id: int, event_type: str = "attendance_update"):
         with self._lock:
-            websocket = self.active_connections.get(user_id)
-        if websocket:
+            sockets = list(self.active_connections.get(user_id, {}).values())
+        stale = []
+        for websocket in sockets:
             try:
-                await websocket.send_json({"type": "attendance_update"})
+                await websocket.send_json({"type": event_type})
             except Exception:
-                self.disconnect(user_id)
+                stale.append(websocket)
+        for websocket in stale:
+            self.disconnect(user_id, websocket)
 
     async def notify_streams(self):
         with self._lock:
@@ -63,5 +72,13 @@ class AttendanceConnectionManager:
             return
         asyncio.run_coroutine_threadsafe(self.notify_attendance_change(user_id), loop)
 
+    def notify_task_change_threadsafe(self, user_id: int):
+        # Running-timer changes go to the user's own sockets only; every open
+        # tracker refetches /tasks/active instead of polling for it.
+        loop = self._loop
+        if not loop or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.notify(user_id, "task_update"), loop)
+
 
 attendance_ws_manager = AttendanceConnectionManager()
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
 from app.config import settings
@@ -46,40 +47,51 @@ def get_current_user(
             detail="Invalid token subject"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    session_id = payload.get("sid")
+    if not session_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
+            detail="Session not found"
         )
 
-    session_id = payload.get("sid")
-    if not session_id:
+    # User and live session in one round-trip; the outer join keeps
+    # "user missing" distinguishable from "session missing".
+    row = db.query(User, UserSession).outerjoin(
+        UserSession,
+        and_(
+            UserSession.user_id == User.id,
+            UserSession.session_id == session_id,
+            UserSession.revoked_at == None
+        )
+    ).filter(User.id == user_id).first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Session not found"
+            detail="User not found"
         )
+    user, session = row
 
     now = datetime.now(timezone.utc)
-    session = db.query(UserSession).filter(
-        UserSession.session_id == session_id,
-        UserSession.user_id == user_id,
-        UserSession.revoked_at == None
-    ).first()
-
     if not session or session.expires_at < now:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Session expired"
         )
 
+    # Only persist activity once per touch interval; writing last_seen_at on
+    # every request turned each authenticated read into an UPDATE + COMMIT.
+    # last_seen_at can therefore trail the real last request by up to one
+    # interval, so the idle window is measured from the latest possible one.
+    touch_interval = timedelta(seconds=settings.SESSION_TOUCH_INTERVAL_SECONDS)
     idle_timeout = timedelta(minutes=settings.SESSION_IDLE_TIMEOUT_MINUTES)
-    if session.last_seen_at and (now - session.last_seen_at) > idle_timeout:
-        close_at = session.last_seen_at + idle_timeout
+    if session.last_seen_at and (now - session.last_seen_at) > touch_interval + idle_timeout:
+        close_at = session.last_seen_at + touch_interval + idle_timeout
         close_open_attendances_for_user(user_id, close_at, db)
 
-    session.last_seen_at = now
-    db.commit()
+    if not session.last_seen_at or (now - session.last_seen_at) >= touch_interval:
+        session.last_seen_at = now
+        db.commit()
 
     return user
 
@@ -0,0 +1,20 @@
+from contextvars import ContextVar
+from datetime import date
+from typing import Optional
+
+# Set once per HTTP request by the middleware in main.py, so validators that
+# compare against "today" share one value for the whole request.
+_request_today: ContextVar[Optional[date]] = ContextVar("request_today", default=None)
+
+
+def set_request_today(value: date):
+    return _request_today.set(value)
+
+
+def reset_request_today(token) -> None:
+    _request_today.reset(token)
+
+
+def request_today() -> date:
+    """Today's date for the current request; falls back to date.today() outside one."""
+    return _request_today.get() or date.today()
@@ -4,7 +4,12 @@ from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
 
 
 def hash_password(password: str) -> str:
@@ -15,6 +20,11 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password, hashed_password) -> tuple[bool, str | None]:
+    """Verify, and return a replacement hash when the stored one was made below the configured cost."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 
 def _create_token(data: dict, expires_delta: timedelta) -> str:
     now = datetime.now(timezone.utc)
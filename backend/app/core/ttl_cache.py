@@ -0,0 +1,46 @@
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small per-process cache with a time-to-live per entry.
+
+    An entry can be tagged with a version (for example a row's version
+    column); get() only returns it while the caller's version still matches.
+    When the cache is full it is cleared outright rather than evicting
+    entry by entry: the callers hold cheap-to-rebuild read results.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Optional[int], Any]] = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None, version: Optional[int] = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] > monotonic() and entry[1] == version:
+            return entry[2]
+        return default
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = (monotonic() + self.ttl_seconds, version, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
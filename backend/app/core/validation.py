@@ -42,6 +42,34 @@ def require_employee_exists(db: Session, user_id: int, detail: str = "Employee n
     return employee
 
 
+def get_active_employees(db: Session, user_ids: Iterable[int]) -> dict[int, User]:
+    """Active employees among ``user_ids``, keyed by id, fetched in one query."""
+    ids = {int(uid) for uid in user_ids}
+    if not ids:
+        return {}
+    employees = db.query(User).filter(
+        User.id.in_(ids),
+        User.role == "employee",
+        User.is_active == True,  # noqa: E712
+    ).all()
+    return {employee.id: employee for employee in employees}
+
+
+def require_active_employees(
+    db: Session,
+    user_ids: Iterable[int],
+    detail: str = "One or more team members are invalid",
+) -> dict[int, User]:
+    ids = {int(uid) for uid in user_ids}
+    employees = get_active_employees(db, ids)
+    if len(employees) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+        )
+    return employees
+
+
 def ensure_employees_available(db: Session) -> int:
     count = db.query(User).filter(
         User.role == "employee",
@@ -3,18 +3,35 @@ from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
 db_url = settings.DATABASE_URL
+
+# Sync endpoints run on AnyIO's worker threads; main.py sizes that pool to
+# match, so requests are bounded by DB connections rather than threads.
+DB_POOL_SIZE = settings.DB_POOL_SIZE
+DB_MAX_OVERFLOW = settings.DB_MAX_OVERFLOW
 engine_kwargs = {
     "echo": False,
     "pool_pre_ping": True,
     "pool_recycle": 1800,
+    # Room for every distinct statement shape the routes compile (default is 500).
+    "query_cache_size": 1200,
 }
 
 if db_url.startswith("sqlite"):
     engine_kwargs["connect_args"] = {"check_same_thread": False}
 else:
     # Conservative pool defaults for burst traffic (e.g. many users clocking in together).
-    engine_kwargs["pool_size"] = 20
-    engine_kwargs["max_overflow"] = 40
+    engine_kwargs["pool_size"] = DB_POOL_SIZE
+    engine_kwargs["max_overflow"] = DB_MAX_OVERFLOW
+    # Hand out the most recently used connection first: steady polling
+    # (/tasks/active) reuses a warm core of connections and the overflow
+    # ones go idle and get recycled instead of being cycled round-robin.
+    engine_kwargs["pool_use_lifo"] = True
+    # Fail fast instead of queueing forever when the pool is exhausted.
+    engine_kwargs["pool_timeout"] = settings.DB_POOL_TIMEOUT_SECONDS
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        engine_kwargs["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        }
 
 engine = create_engine(db_url, **engine_kwargs)
 
@@ -24,6 +41,20 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+def commit_without_expire(db) -> None:
+    """Commit, keeping loaded attributes instead of expiring them.
+
+    For rows whose columns were all just set in Python, where the default
+    expire-on-commit would only cost a reload SELECT on the next access.
+    """
+    previous = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = previous
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,6 +1,8 @@
 
+import logging
 import re
 
+import anyio.to_thread
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from app.database.session import engine
 from app.database.base import Base
@@ -12,7 +14,7 @@ from app.routes import admin
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -27,17 +29,35 @@ from app.models.holiday import Holiday
 from app.models.attendance_edit_log import AttendanceEditLog
 from app.models.research import ResearchColumn, ResearchRow, ResearchCell, ResearchColumnPermission, ResearchDocument, ResearchDocumentPermission
 from app.schemas.research import ResearchFileCreate, ResearchFileOut, CellUpdate
+from app.schemas.user import PATTERN_ERROR_MESSAGES
 from app.routes import research,holiday
 from app.routes import chat
 from app.core.security import decode_token
+from app.core.request_context import reset_request_today, set_request_today
 from app.core.attendance_ws_manager import attendance_ws_manager
 from app.core.notification_ws_manager import notification_ws_manager
-from app.database.session import SessionLocal
-from app.services.tracker_service import ensure_task_schema
+from app.database.session import SessionLocal, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from app.services.tracker_service import close_duplicate_running_logs, ensure_task_schema
+from app.routes.research import ensure_research_schema
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+
+class UploadStaticFiles(StaticFiles):
+    """
+    Uploaded files are written under unique names (uuid/timestamp) and never
+    rewritten, so browsers and any CDN in front can cache them indefinitely.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", "public, max-age=31536000, immutable")
+        return response
+
+
+app.mount("/uploads", UploadStaticFiles(directory="uploads"), name="uploads")
 
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +76,15 @@ app.add_middleware(
 _LOCAL_DEV_ORIGIN_RE = re.compile(r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$")
 
 
+@app.middleware("http")
+async def bind_request_today(request: Request, call_next):
+    token = set_request_today(date.today())
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_today(token)
+
+
 @app.middleware("http")
 async def ensure_local_dev_cors(request: Request, call_next):
     origin = (request.headers.get("origin") or "").strip()
@@ -77,12 +106,48 @@ async def ensure_local_dev_cors(request: Request, call_next):
 
     return response
 
+@app.on_event("startup")
+def configure_threadpool():
+    # Default is 40 threads; let sync endpoints use every pooled connection.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, DB_POOL_SIZE + DB_MAX_OVERFLOW)
+
+
 @app.on_event("startup")
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # Schema/index builds can legitimately outlast the request statement_timeout.
+            conn.exec_driver_sql("SET statement_timeout = 0")
+        Base.metadata.create_all(bind=conn)
+        conn.commit()
+        # The unique running-timer index cannot be built over duplicate open logs.
+        closed = close_duplicate_running_logs(conn)
+        conn.commit()
+        if closed:
+            logger.warning("Closed %d duplicate running task logs", closed)
+        # create_all() skips tables that already exist, so add any indexes declared
+        # on the models after the table was first created.
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(bind=conn, checkfirst=True)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    logger.exception("Could not create index %s", index.name)
+                    # Unique indexes back integrity guarantees the routes rely on.
+                    if index.unique:
+                        raise
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("RESET statement_timeout")
+            # Commit, or leaving the block rolls the RESET back and the pooled
+            # connection keeps statement_timeout = 0 for its next request.
+            conn.commit()
     db = SessionLocal()
     try:
         ensure_task_schema(db)
+        ensure_research_schema(db)
     finally:
         db.close()
 
@@ -105,6 +170,9 @@ def _format_validation_messages(exc: RequestValidationError, request: Request) -
             messages.append(f"{field} cannot be empty")
         elif "none.not_allowed" in err_type:
             messages.append(f"{field} cannot be null")
+        elif err_type == "string_pattern_mismatch":
+            pattern = (err.get("ctx") or {}).get("pattern")
+            messages.append(f"{field}: {PATTERN_ERROR_MESSAGES.get(pattern, message)}")
         elif field:
             messages.append(f"{field}: {message}")
         else:
@@ -160,7 +228,7 @@ async def attendance_ws(websocket: WebSocket, user_id: int):
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        attendance_ws_manager.disconnect(user_id)
+        attendance_ws_manager.disconnect(user_id, websocket)
 
 
 @app.websocket("/ws/notifications/{user_id}")
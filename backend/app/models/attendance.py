@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from app.database.base import Base
 from sqlalchemy.orm import relationship
 
@@ -31,7 +31,15 @@ class Attendance(Base):
     updated_by_admin = relationship("User", foreign_keys=[updated_by_admin_id])
 
     __table_args__ = (
+        # Also the (user_id, date) lookup index for today's row and month ranges.
         UniqueConstraint("user_id", "date", name="unique_user_date"),
+        # Open sessions, probed by auto-close on nearly every attendance/task request.
+        Index(
+            "ix_attendance_logs_user_open",
+            "user_id",
+            postgresql_where=clock_in_time.isnot(None) & clock_out_time.is_(None),
+            sqlite_where=clock_in_time.isnot(None) & clock_out_time.is_(None),
+        ),
     )
 
     
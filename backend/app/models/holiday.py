@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Date, Boolean, Enum, Index
 from app.database.base import Base
 import enum
 
@@ -21,4 +21,9 @@ class Holiday(Base):
     department = Column(String, default="All", nullable=False)
 
     # Repeat every year on same month/day
-    repeat_yearly = Column(Boolean, default=False, nullable=False)
\ No newline at end of file
+    repeat_yearly = Column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        Index("ix_holidays_name_date_dept", "name", "date", "department"),
+        Index("ix_holidays_date", "date"),
+    )
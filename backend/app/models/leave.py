@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Float, Time
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Float, Time, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database.base import Base
@@ -35,3 +35,8 @@ class Leave(Base):
     # relationships
     employee = relationship("User", foreign_keys=[user_id])
     approver = relationship("User", foreign_keys=[approved_by])
+
+    __table_args__ = (
+        Index("ix_leaves_user_created", "user_id", "created_at"),
+        Index("ix_leaves_status_created", "status", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 
 from app.database.base import Base
@@ -18,3 +18,15 @@ class Notification(Base):
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Notification feed: WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT n
+        # becomes a range scan with no sort step.
+        Index("ix_notifications_user_created", "user_id", created_at.desc(), id.desc()),
+        # Unread badge count: only unread rows are indexed.
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=(is_read == False),  # noqa: E712
+            sqlite_where=(is_read == False),  # noqa: E712
+        ),
+    )
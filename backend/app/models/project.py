@@ -6,6 +6,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Table
 )
 from sqlalchemy.sql import func
@@ -22,6 +23,8 @@ project_team_members = Table(
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE")),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE")),
+    Index("ix_project_team_members_project_user", "project_id", "user_id"),
+    Index("ix_project_team_members_user", "user_id"),
 )
 
 class Project(Base):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.base import Base
@@ -14,6 +14,8 @@ class ResearchFile(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     type = Column(String, nullable=False)  # excel | document
+    # Bumped by every content/permission write; keys the file-detail cache.
+    version = Column(Integer, default=0, server_default="0", nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -32,6 +34,10 @@ class ResearchColumn(Base):
     column_name = Column(String, nullable=False)
     column_order = Column(Integer)
 
+    __table_args__ = (
+        Index("ix_research_columns_file_order", "file_id", "column_order"),
+    )
+
 
 class ResearchRow(Base):
     __tablename__ = "research_rows"
@@ -40,6 +46,10 @@ class ResearchRow(Base):
     file_id = Column(Integer, ForeignKey("research_files.id", ondelete="CASCADE"))
     row_number = Column(Integer)
 
+    __table_args__ = (
+        Index("ix_research_rows_file_number", "file_id", "row_number"),
+    )
+
 
 class ResearchCell(Base):
     __tablename__ = "research_cells"
@@ -51,6 +61,11 @@ class ResearchCell(Base):
     updated_by = Column(Integer, ForeignKey("users.id"))
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_research_cells_row_column", "row_id", "column_id"),
+        Index("ix_research_cells_column", "column_id"),
+    )
+
 
 class ResearchColumnPermission(Base):
     __tablename__ = "research_column_permissions"
@@ -61,6 +76,11 @@ class ResearchColumnPermission(Base):
     can_view = Column(Boolean, default=False)
     can_edit = Column(Boolean, default=False)
 
+    __table_args__ = (
+        Index("ix_research_column_permissions_user_view", "user_id", "can_view"),
+        Index("ix_research_column_permissions_user_column", "user_id", "column_id"),
+    )
+
 
 # ===============================
 # DOCUMENT TABLES
@@ -83,3 +103,7 @@ class ResearchDocumentPermission(Base):
     id = Column(Integer, primary_key=True)
     document_id = Column(Integer, ForeignKey("research_documents.id", ondelete="CASCADE"))
     user_id = Column(Integer, ForeignKey("users.id"))
+
+    __table_args__ = (
+        Index("ix_research_document_permissions_doc_user", "document_id", "user_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
@@ -15,4 +15,18 @@ class TaskTimeLog(Base):
 
     # Relationships
     task = relationship("Task", back_populates="time_logs")
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+    __table_args__ = (
+        # Running timer lookups: WHERE user_id = ? [AND task_id = ?] AND end_time IS NULL.
+        # Unique so the database also enforces one running timer per user.
+        Index(
+            "ix_task_time_logs_user_running",
+            "user_id",
+            unique=True,
+            postgresql_where=end_time.is_(None),
+            sqlite_where=end_time.is_(None),
+        ),
+        # Per-task totals and history: WHERE task_id IN (...) AND user_id = ?.
+        Index("ix_task_time_logs_task_user", "task_id", "user_id"),
+    )
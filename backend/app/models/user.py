@@ -46,3 +46,6 @@ class User(Base):
     force_password_change = Column(Boolean, default=True)
     profile_image = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Read server defaults back through INSERT ... RETURNING rather than a later SELECT.
+    __mapper_args__ = {"eager_defaults": True}
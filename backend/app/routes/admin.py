@@ -1,14 +1,16 @@
 import secrets
 import json
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, extract, or_, inspect, text
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import BigInteger, and_, cast, extract, func, or_, inspect, text
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import date, datetime, time, timezone
 from calendar import monthrange
 from pydantic import ValidationError
 
-from app.database.session import get_db
+from app.database.session import commit_without_expire, get_db
 from app.core.dependencies import get_current_admin
 from app.core.security import hash_password, verify_password
 
@@ -36,17 +38,22 @@ from app.core.validation import (
     require_employee_exists,
 )
 
-from app.schemas.user import EmployeeCreate, EmployeeCreateResponse, EmployeeOut, AdminCreate, AdminProfileUpdateSchema
-from app.schemas.task import TaskCreate, TaskOut, TaskUpdate
+from app.schemas.user import EmployeeCreate, EmployeeCreateResponse, EmployeeOut, EmployeeOutList, AdminCreate, AdminProfileUpdateSchema, PATTERN_ERROR_MESSAGES
+from app.schemas.task import TaskCreate, TaskOut, TaskOutList, TaskUpdate
 
 from app.utils.email import send_employee_credentials
 from app.services.notification_service import push_notification
+from app.services.tracker_service import invalidate_active_task
 
 import shutil
 import os
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+ADMIN_ID_PREFIX = "ADMIN-"
+ADMIN_ID_ATTEMPTS = 5
+
+
 def _send_employee_credentials_safely(
     to_email: str,
     employee_id: str,
@@ -91,25 +98,20 @@ def create_employee(
 ):
     ensure_user_shift_schema(db)
 
-    employee_id = payload.employee_id.strip().upper()
+    employee_id = payload.employee_id.upper()
     if not employee_id:
         raise HTTPException(status_code=400, detail="Employee ID is required")
 
-    if db.query(User).filter(User.email == payload.email).first():
+    if db.query(db.query(User).filter(User.email == payload.email).exists()).scalar():
         raise HTTPException(status_code=400, detail="Email already exists")
-    if db.query(User).filter(User.employee_id == employee_id).first():
+    if db.query(db.query(User).filter(User.employee_id == employee_id).exists()).scalar():
         raise HTTPException(status_code=400, detail="Employee ID already exists")
 
     temp_password = secrets.token_urlsafe(8)
 
+    # EmployeeCreate has already stripped and validated every field.
     employee = User(
-        name=payload.name,
-        email=payload.email,
-        department=payload.department,
-        designation=payload.designation,
-        shift=payload.shift,
-        shift_start_time=payload.shift_start_time,
-        shift_end_time=payload.shift_end_time,
+        **payload.model_dump(exclude={"employee_id"}),
         role="employee",
         employee_id=employee_id,
         password_hash=hash_password(temp_password),
@@ -118,8 +120,7 @@ def create_employee(
     )
 
     db.add(employee)
-    db.commit()
-    db.refresh(employee)
+    commit_without_expire(db)
 
     background_tasks.add_task(
             _send_employee_credentials_safely,
@@ -135,12 +136,14 @@ def create_employee(
     }
 
 
-@router.get("/employees", response_model=List[EmployeeOut])
+@router.get("/employees", response_model=List[EmployeeOut], response_class=ORJSONResponse)
 def get_employees(
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    return db.query(User).filter(User.role == "employee").all()
+    employees = db.query(User).filter(User.role == "employee").all()
+    # Rows come straight from the users table, so skip re-validating them.
+    return ORJSONResponse(EmployeeOutList.dump_python([EmployeeOut.from_orm_trusted(e) for e in employees]))
 
 
 @router.post("/employees/{employee_id}/toggle-status")
@@ -222,15 +225,19 @@ def create_task(
     return new_task
 
 
-@router.get("/tasks", response_model=List[TaskOut])
+@router.get("/tasks", response_model=List[TaskOut], response_class=ORJSONResponse)
 def get_all_tasks(
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
     tasks = (
         db.query(Task)
-        .outerjoin(Project, Task.project_id == Project.id)
-        .outerjoin(User, Task.assigned_to == User.id)
+        .options(
+            joinedload(Task.project),
+            joinedload(Task.assigned_user),
+            joinedload(Task.created_user),
+            raiseload("*", sql_only=True),
+        )
         .order_by(Task.id.desc())
         .all()
     )
@@ -256,7 +263,7 @@ def get_all_tasks(
             "estimated_hours": task.estimated_hours
         })
 
-    return result
+    return ORJSONResponse(TaskOutList.dump_python(TaskOutList.validate_python(result)))
 
 
 @router.put("/tasks/{task_id}", response_model=TaskOut)
@@ -293,11 +300,15 @@ def update_task(
             raise HTTPException(status_code=400, detail="Please select at least one employee.")
         require_employee_exists(db, int(updates["assigned_to"]), detail="Selected employee not found")
 
+    previous_assignee = task.assigned_to
     for key, value in updates.items():
         setattr(task, key, value)
 
     db.commit()
     db.refresh(task)
+    invalidate_active_task(previous_assignee)
+    if task.assigned_to != previous_assignee:
+        invalidate_active_task(task.assigned_to)
 
     return {
         "id": task.id,
@@ -333,6 +344,7 @@ def delete_task(
 
     db.delete(task)
     db.commit()
+    invalidate_active_task(assigned_to)
 
     if assigned_to:
         push_notification(
@@ -635,7 +647,7 @@ def append_edit_log(
     ))
 
 
-@router.get("/attendance")
+@router.get("/attendance", response_class=ORJSONResponse)
 def get_monthly_attendance(
     month: int,
     year: int,
@@ -651,10 +663,11 @@ def get_monthly_attendance(
 
     for user in users:
         auto_close_open_attendances_for_user(user.id, db, now=now)
+        # A plain date range (not EXTRACT) so the (user_id, date) unique index is used.
         records = db.query(Attendance).filter(
             Attendance.user_id == user.id,
-            extract("month", Attendance.date) == month,
-            extract("year", Attendance.date) == year
+            Attendance.date >= date(year, month, 1),
+            Attendance.date <= date(year, month, days_in_month)
         ).all()
         attendance_by_date = {r.date: r for r in records}
         leave_statuses = get_approved_leave_statuses_for_month(db, user.id, month, year)
@@ -728,7 +741,9 @@ def get_monthly_attendance(
             "attendance_percentage": attendance_percentage,
         })
 
-    return result
+    # Employees x days of nested dicts: orjson encodes it directly instead of
+    # jsonable_encoder walking every value first.
+    return ORJSONResponse(result)
 
 
 @router.get("/attendance/details")
@@ -1094,8 +1109,8 @@ def get_productivity(
 
         attendance_records = db.query(Attendance).filter(
             Attendance.user_id == user.id,
-            extract("month", Attendance.date) == month,
-            extract("year", Attendance.date) == year
+            Attendance.date >= month_start.date(),
+            Attendance.date < month_end.date()
         ).all()
         attendance_seconds = 0
         for record in attendance_records:
@@ -1183,15 +1198,18 @@ def update_admin_profile(
             designation=designation,
         )
     except ValidationError as exc:
-        raise HTTPException(status_code=422, detail=exc.errors()) from exc
+        errors = []
+        for err in exc.errors(include_url=False):
+            pattern = (err.pop("ctx", None) or {}).get("pattern")
+            errors.append({**err, "msg": PATTERN_ERROR_MESSAGES.get(pattern, err.get("msg"))})
+        raise HTTPException(status_code=422, detail=errors) from exc
     
     # Check email uniqueness if changing
     if email is not None and not validated.email:
         raise HTTPException(status_code=422, detail="Email is required")
 
     if validated.email and validated.email != current_admin.email:
-        existing = db.query(User).filter(User.email == validated.email).first()
-        if existing:
+        if db.query(db.query(User).filter(User.email == validated.email).exists()).scalar():
             raise HTTPException(status_code=400, detail="Email already exists")
         current_admin.email = validated.email
     
@@ -1283,29 +1301,47 @@ def create_admin(
     """Create a new admin user"""
     
     # Check if email already exists
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
+    if db.query(db.query(User).filter(User.email == payload.email).exists()).scalar():
         raise HTTPException(status_code=400, detail="Email already exists")
     
-    # Generate employee ID for admin
-    admin_count = db.query(User).filter(User.role == "admin").count()
-    employee_id = f"ADMIN-{str(admin_count + 1).zfill(4)}"
-    
-    # Create new admin
-    new_admin = User(
-        name=payload.name,
-        email=payload.email,
-        employee_id=employee_id,
-        password_hash=hash_password(payload.password),
-        role="admin",
-        is_active=True,
-        force_password_change=False
-    )
-    
-    db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
-    
+    password_hash = hash_password(payload.password)
+
+    # Number from the highest existing ADMIN- ID instead of counting admins:
+    # deleted or demoted admins made the count reuse taken IDs, and two
+    # concurrent requests read the same count. A concurrent insert can still
+    # take the same number, so a unique-constraint collision re-reads and retries.
+    for _ in range(ADMIN_ID_ATTEMPTS):
+        # Compare the suffixes as numbers (ADMIN-10000 > ADMIN-9999) and skip
+        # hand-entered IDs whose suffix is not all digits.
+        last_number = db.query(
+            func.max(cast(func.substr(User.employee_id, len(ADMIN_ID_PREFIX) + 1), BigInteger))
+        ).filter(
+            User.employee_id.regexp_match(f"^{ADMIN_ID_PREFIX}[0-9]+$")
+        ).scalar() or 0
+
+        new_admin = User(
+            name=payload.name,
+            email=payload.email,
+            employee_id=f"{ADMIN_ID_PREFIX}{str(last_number + 1).zfill(4)}",
+            password_hash=password_hash,
+            role="admin",
+            is_active=True,
+            force_password_change=False
+        )
+
+        db.add(new_admin)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            if db.query(db.query(User).filter(User.email == payload.email).exists()).scalar():
+                raise HTTPException(status_code=400, detail="Email already exists")
+            continue
+        db.refresh(new_admin)
+        break
+    else:
+        raise HTTPException(status_code=409, detail="Could not allocate an admin ID. Please retry.")
+
     return {
         "message": "Admin created successfully",
         "admin": {
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import extract, or_, inspect, text
 from datetime import datetime, timezone
@@ -11,7 +12,6 @@ from app.core.dependencies import get_current_user
 from app.models.attendance import Attendance
 from app.models.holiday import Holiday
 from app.models.leave import Leave
-from datetime import time
 from app.models.task_time_log import TaskTimeLog
 from app.services.attendance_service import (
     clock_in,
@@ -24,6 +24,7 @@ from app.services.attendance_service import (
     get_attendance_status_meta,
     get_clock_in_lock_reason,
     get_ist_date,
+    ist_day_bounds_utc,
     IST
 )
 
@@ -96,7 +97,7 @@ def clock_in_route(
     db: Session = Depends(get_db)
 ):
     ensure_attendance_schema(db)
-    return clock_in(current_user, db)
+    return clock_in(current_user, db, datetime.now(timezone.utc))
 
 
 # ---------------- CLOCK OUT ----------------
@@ -125,7 +126,7 @@ def clock_out_route(
             return {"message": "Already clocked out", "auto_closed": True}
         raise HTTPException(status_code=400, detail="Not clocked in")
 
-    clock_out(attendance, db)
+    clock_out(attendance, db, now)
     return {"message": "Clocked out successfully"}
 
 
@@ -185,8 +186,7 @@ def attendance_summary(
     attendance_seconds = get_attendance_worked_seconds(attendance, now)
 
     # -------- TASK TIME --------
-    start_of_day = datetime.combine(today, time.min, tzinfo=IST).astimezone(timezone.utc)
-    end_of_day = datetime.combine(today, time.max, tzinfo=IST).astimezone(timezone.utc)
+    start_of_day, end_of_day = ist_day_bounds_utc(today)
 
     task_logs = db.query(TaskTimeLog).filter(
         TaskTimeLog.user_id == current_user.id,
@@ -213,7 +213,7 @@ def attendance_summary(
 
 
 # ---------------- HISTORY ----------------
-@router.get("/history")
+@router.get("/history", response_class=ORJSONResponse)
 def attendance_history(
     month: int = Query(default=None, ge=1, le=12),
     year: int = Query(default=None, ge=2000, le=2100),
@@ -314,7 +314,7 @@ def attendance_history(
     avg_hours = (total_work_seconds / max(days_in_month - absent_days, 1)) / 3600 if result else 0
     result.sort(key=lambda item: item["date"], reverse=True)
 
-    return {
+    return ORJSONResponse({
         "month": target_month,
         "year": target_year,
         "records": result,
@@ -324,4 +324,4 @@ def attendance_history(
             "late_days": late_days,
             "avg_hours": f"{avg_hours:.1f}h"
         }
-    }
+    })
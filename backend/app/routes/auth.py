@@ -8,7 +8,7 @@ from app.database.session import get_db
 from app.models.user import User
 from app.models.user_session import UserSession
 from app.core.security import (
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -79,10 +79,16 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
     else:
         user = db.query(User).filter(User.employee_id == login_id).first()
 
-    if not user or not verify_password(data.password, user.password_hash):
+    verified, upgraded_hash = (
+        verify_and_update_password(data.password, user.password_hash) if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is inactive")
+    if upgraded_hash:
+        # Committed together with the new session below.
+        user.password_hash = upgraded_hash
 
     now = datetime.now(timezone.utc)
     session = _create_user_session(user.id, db, now)
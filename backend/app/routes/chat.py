@@ -2,6 +2,7 @@ from datetime import datetime, timedelta, timezone
 import asyncio
 
 from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import desc, func
 from sqlalchemy.orm import Session
 
@@ -132,17 +133,28 @@ def _conversation_unread_count(db: Session, conversation_id: int, user_id: int)
     return int(unread_count)
 
 
+def _conversation_members(db: Session, conversation_ids: list[int]) -> dict[int, list[User]]:
+    # One join for every requested conversation, bucketed by conversation id.
+    members_by_conversation: dict[int, list[User]] = {cid: [] for cid in conversation_ids}
+    rows = db.query(ChatConversationMember.conversation_id, User).join(
+        User, ChatConversationMember.user_id == User.id
+    ).filter(
+        ChatConversationMember.conversation_id.in_(conversation_ids)
+    ).order_by(ChatConversationMember.id).all()
+    for conversation_id, member in rows:
+        members_by_conversation[conversation_id].append(member)
+    return members_by_conversation
+
+
 def _conversation_payload(
     db: Session,
     conversation: ChatConversation,
     current_user: User,
     online_ids: set[int],
+    members: list[User] | None = None,
 ) -> ChatConversationOut:
-    members = db.query(User).join(
-        ChatConversationMember, ChatConversationMember.user_id == User.id
-    ).filter(
-        ChatConversationMember.conversation_id == conversation.id
-    ).all()
+    if members is None:
+        members = _conversation_members(db, [conversation.id])[conversation.id]
 
     member_payload = [
         ChatUserOut(
@@ -278,7 +290,11 @@ def list_conversations(
     ).order_by(desc(ChatConversation.updated_at)).all()
 
     online_ids = _active_online_user_ids(db)
-    return [_conversation_payload(db, conv, current_user, online_ids) for conv in conversations]
+    members_by_conversation = _conversation_members(db, [conv.id for conv in conversations])
+    return [
+        _conversation_payload(db, conv, current_user, online_ids, members_by_conversation[conv.id])
+        for conv in conversations
+    ]
 
 
 @router.get("/unread-count", response_model=ChatUnreadSummaryOut)
@@ -319,7 +335,13 @@ def get_messages(
 ):
     _ensure_membership(db, conversation_id, current_user.id)
 
-    messages = db.query(ChatMessage).filter(
+    messages = db.query(
+        ChatMessage.id,
+        ChatMessage.conversation_id,
+        ChatMessage.sender_id,
+        ChatMessage.message,
+        ChatMessage.created_at,
+    ).filter(
         ChatMessage.conversation_id == conversation_id
     ).order_by(desc(ChatMessage.created_at)).limit(limit).all()
     messages = list(reversed(messages))
@@ -332,16 +354,17 @@ def get_messages(
         member.last_read_at = datetime.now(timezone.utc)
         db.commit()
 
-    return [
-        ChatMessageOut(
-            id=m.id,
-            conversation_id=m.conversation_id,
-            sender_id=m.sender_id,
-            message=m.message,
-            timestamp=m.created_at,
-        )
+    # Plain column rows already match ChatMessageOut; orjson encodes them directly.
+    return ORJSONResponse([
+        {
+            "id": m.id,
+            "conversation_id": m.conversation_id,
+            "sender_id": m.sender_id,
+            "message": m.message,
+            "timestamp": m.created_at,
+        }
         for m in messages
-    ]
+    ])
 
 
 @router.post("/messages", response_model=ChatMessageOut)
@@ -1,61 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime, timezone
 
 from app.database.session import get_db
 from app.models.project import Project
 from app.schemas.project import ProjectOut
 from app.core.dependencies import get_current_user
+from app.services.project_service import get_project_stats, project_load_options, serialize_project
 
 router = APIRouter(prefix="/projects", tags=["Employee Projects"])
 
 
-def serialize_project(project: Project) -> dict:
-    tasks = project.tasks or []
-    task_count = len(tasks)
-    completed_count = len([t for t in tasks if t.status == "completed"])
-    project_progress = int(round((completed_count / task_count) * 100)) if task_count else 0
-
-    now = datetime.now(timezone.utc)
-    total_seconds = 0
-    for task in tasks:
-        for log in (task.time_logs or []):
-            if not log.start_time:
-                continue
-            end_time = log.end_time or now
-            if end_time > log.start_time:
-                total_seconds += int((end_time - log.start_time).total_seconds())
-
-    return {
-        "id": project.id,
-        "name": project.name,
-        "description": project.description,
-        "start_date": project.start_date,
-        "end_date": project.end_date,
-        "status": project.status,
-        "created_by": project.created_by,
-        "owner_id": project.owner_id,
-        "created_at": project.created_at,
-        "owner": project.owner,
-        "team_members": project.team_members or [],
-        "tasks": tasks,
-        "task_count": task_count,
-        "project_progress": project_progress,
-        "total_hours": round(total_seconds / 3600, 1),
-    }
-
-
 @router.get("/my", response_model=List[ProjectOut])
 def get_my_projects(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    projects = db.query(Project).filter(
+    projects = db.query(Project).options(*project_load_options()).filter(
         (Project.owner_id == current_user.id) |
         (Project.team_members.any(id=current_user.id))
     ).all()
-    return [serialize_project(project) for project in projects]
+    stats = get_project_stats(db, [project.id for project in projects])
+    return [serialize_project(project, stats[project.id]) for project in projects]
 
 @router.get("/my/{project_id}", response_model=ProjectOut)
 def get_my_project_detail(
@@ -63,7 +29,7 @@ def get_my_project_detail(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(*project_load_options()).filter(Project.id == project_id).first()
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -75,4 +41,4 @@ def get_my_project_detail(
     ):
         raise HTTPException(status_code=403, detail="Access denied")
 
-    return serialize_project(project)
+    return serialize_project(project, get_project_stats(db, [project.id])[project.id])
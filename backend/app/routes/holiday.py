@@ -1,22 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File, Form
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
 import io, csv
 from datetime import date as date_type, datetime as datetime_type
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from app.database.session import get_db
+from app.database.session import SessionLocal, get_db
 from app.core.dependencies import get_current_user
 from app.schemas.holiday import HolidayCreate, HolidayUpdate, HolidayOut, HolidayBulkDeleteRequest
 from app.services import holiday_service
 from app.models.holiday import Holiday, HolidayType
-from app.services.notification_service import notify_all_employees, ensure_tomorrow_holiday_notifications
+from app.services.notification_service import (
+    notify_all_employees,
+    ensure_tomorrow_holiday_notifications,
+    notify_holidays_added,
+    run_with_new_session,
+)
 
 router = APIRouter(prefix="/holidays", tags=["Holidays"])
 
 
 # ─── LIST ──────────────────────────────────────────────────────────────────────
-@router.get("/", response_model=list[HolidayOut])
+@router.get("/", response_model=list[HolidayOut], response_class=ORJSONResponse)
 def list_holidays(
     year: Optional[int] = Query(default=None),
     month: Optional[int] = Query(default=None),
@@ -38,12 +44,14 @@ def list_holidays(
 @router.post("/", response_model=HolidayOut, status_code=201)
 def create_holiday(
     data: HolidayCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     holiday = holiday_service.create_holiday(db, data)
-    notify_all_employees(
-        db,
+    background_tasks.add_task(
+        run_with_new_session,
+        notify_all_employees,
         title="New holiday added",
         message=f"Holiday declared on {holiday.date}: {holiday.name}",
         event_type="holiday_added",
@@ -51,7 +59,7 @@ def create_holiday(
         reference_id=holiday.id,
         created_by=getattr(current_user, "id", None)
     )
-    ensure_tomorrow_holiday_notifications(db)
+    background_tasks.add_task(run_with_new_session, ensure_tomorrow_holiday_notifications)
     return holiday
 
 
@@ -73,13 +81,14 @@ def get_holiday(
 def update_holiday(
     holiday_id: int,
     data: HolidayUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     holiday = holiday_service.update_holiday(db, holiday_id, data)
     if not holiday:
         raise HTTPException(status_code=404, detail="Holiday not found")
-    ensure_tomorrow_holiday_notifications(db)
+    background_tasks.add_task(run_with_new_session, ensure_tomorrow_holiday_notifications)
     return holiday
 
 
@@ -106,6 +115,27 @@ def bulk_delete_holidays(
     return {"deleted": deleted}
 
 
+def _stream_holidays_csv(year: Optional[int]) -> Iterator[str]:
+    # The response body is produced after the handler returns, so the export
+    # uses its own session rather than the request-scoped one.
+    db = SessionLocal()
+    try:
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["ID", "Holiday Name", "Date", "Type", "Department", "Repeat Yearly"])
+
+        for count, h in enumerate(holiday_service.iter_holidays(db, year=year), start=1):
+            writer.writerow([h.id, h.name, str(h.date), h.type.value, h.department, h.repeat_yearly])
+            if count % 500 == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+
+        yield output.getvalue()
+    finally:
+        db.close()
+
+
 # ─── EXPORT CSV ────────────────────────────────────────────────────────────────
 @router.get("/export/csv")
 def export_holidays_csv(
@@ -113,18 +143,8 @@ def export_holidays_csv(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    holidays = holiday_service.get_all_holidays(db, year=year)
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["ID", "Holiday Name", "Date", "Type", "Department", "Repeat Yearly"])
-
-    for h in holidays:
-        writer.writerow([h.id, h.name, str(h.date), h.type.value, h.department, h.repeat_yearly])
-
-    output.seek(0)
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _stream_holidays_csv(year),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=holidays_{year or 'all'}.csv"},
     )
@@ -138,18 +158,144 @@ def check_date_holiday(
     current_user=Depends(get_current_user),
 ):
     """Returns list of holidays on a specific date. Used by frontend attendance calendar."""
-    from datetime import date as date_type
     try:
         target = date_type.fromisoformat(date_str)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-    holidays = holiday_service.get_holidays_for_date(db, target)
-    return [HolidayOut.model_validate(h) for h in holidays]
+    # Payloads are already HolidayOut-validated and JSON-ready; skip the encoder pass.
+    return ORJSONResponse(holiday_service.get_holiday_payloads_for_date(db, target))
+
+
+_HOLIDAY_TYPE_MAP = {
+    "full_day": HolidayType.full_day,
+    "full day": HolidayType.full_day,
+    "first_half": HolidayType.first_half,
+    "first half": HolidayType.first_half,
+    "second_half": HolidayType.second_half,
+    "second half": HolidayType.second_half,
+}
+
+
+def _normalize_header(value: str) -> str:
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _parse_bool(value) -> bool:
+    return str(value or "").strip().lower() in {"true", "1", "yes", "y"}
+
+
+def _parse_type(value) -> HolidayType:
+    return _HOLIDAY_TYPE_MAP.get(str(value or "").strip().lower(), HolidayType.full_day)
+
+
+def _parse_date_value(
+    raw_value,
+    raw_day: str | None,
+    target_year: Optional[int],
+    target_month: Optional[int],
+) -> date_type:
+    resolved_date = None
+    if isinstance(raw_value, datetime_type):
+        resolved_date = raw_value.date()
+    elif isinstance(raw_value, date_type):
+        resolved_date = raw_value
+
+    if target_year is not None and target_month is not None:
+        day_number = None
+        if raw_day:
+            try:
+                day_number = int(str(raw_day).strip())
+            except Exception:
+                day_number = None
+
+        if day_number is None:
+            if resolved_date is not None:
+                day_number = resolved_date.day
+            elif not raw_value:
+                raise ValueError("Either date or day is required")
+            else:
+                parsed = date_type.fromisoformat(str(raw_value).strip())
+                day_number = parsed.day
+
+        return date_type(target_year, target_month, day_number)
+
+    if resolved_date is not None:
+        return resolved_date
+
+    if not raw_value:
+        raise ValueError("Date is required")
+    return date_type.fromisoformat(str(raw_value).strip())
+
+
+def _iter_sheet_rows(row_iter: Iterator[tuple]) -> Iterator[dict]:
+    header_row = next(row_iter, None)
+    if header_row is None:
+        raise HTTPException(status_code=400, detail="Excel file is empty")
+
+    headers = [_normalize_header(h) for h in header_row]
+    for r in row_iter:
+        if not any(cell is not None and str(cell).strip() for cell in r):
+            continue
+        mapped = {}
+        for idx, value in enumerate(r):
+            key = headers[idx] if idx < len(headers) else f"col_{idx}"
+            if isinstance(value, float) and value.is_integer():
+                # calamine reports every numeric cell as float; keep "5" rather than "5.0".
+                value = int(value)
+            mapped[key] = str(value).strip() if value is not None else ""
+        yield mapped
+
+
+def _iter_upload_rows(upload: BinaryIO, filename: str) -> Iterator[dict]:
+    """Yield header-normalized row dicts from an uploaded .csv or .xlsx, one at a time."""
+    if filename.endswith(".csv"):
+        # Decode block by block straight off the spooled upload instead of
+        # holding both the raw bytes and a decoded copy in memory.
+        text_stream = io.TextIOWrapper(upload, encoding="utf-8-sig", errors="ignore", newline="")
+        try:
+            for row in csv.DictReader(text_stream):
+                yield {_normalize_header(k): (v.strip() if isinstance(v, str) else v) for k, v in (row or {}).items()}
+        finally:
+            # Leave the underlying upload open; Starlette closes it.
+            text_stream.detach()
+        return
+
+    file_bytes = upload.read()
+
+    # Prefer the Rust-backed python-calamine reader when it is installed and fall
+    # back to openpyxl otherwise; both feed the same header/row mapping.
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        CalamineWorkbook = None
+
+    if CalamineWorkbook is not None:
+        try:
+            sheet = CalamineWorkbook.from_filelike(io.BytesIO(file_bytes)).get_sheet_by_index(0)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Unable to read Excel file")
+        # iter_rows converts one row at a time; to_python() would build the
+        # whole sheet as Python lists before the first row is mapped.
+        yield from _iter_sheet_rows(sheet.iter_rows())
+        return
+
+    try:
+        from openpyxl import load_workbook
+    except Exception:
+        raise HTTPException(status_code=500, detail="Excel upload requires openpyxl package")
+
+    wb = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        # Iterate lazily; read-only mode keeps the zip handle open until close().
+        yield from _iter_sheet_rows(wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
 
 
 @router.post("/bulk-upload")
 def bulk_upload_holidays(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     target_year: Optional[int] = Form(default=None),
     target_month: Optional[int] = Form(default=None),
@@ -166,167 +312,106 @@ def bulk_upload_holidays(
     if (target_year is None) != (target_month is None):
         raise HTTPException(status_code=400, detail="Select both target year and target month together")
 
-    file_bytes = file.file.read()
-    if not file_bytes:
+    if not file.file.read(1):
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
-
-    def normalize_header(value: str) -> str:
-        return str(value or "").strip().lower().replace(" ", "_")
-
-    def parse_bool(value) -> bool:
-        return str(value or "").strip().lower() in {"true", "1", "yes", "y"}
-
-    def parse_type(value) -> HolidayType:
-        raw = str(value or "").strip().lower()
-        mapping = {
-            "full_day": HolidayType.full_day,
-            "full day": HolidayType.full_day,
-            "first_half": HolidayType.first_half,
-            "first half": HolidayType.first_half,
-            "second_half": HolidayType.second_half,
-            "second half": HolidayType.second_half,
-        }
-        return mapping.get(raw, HolidayType.full_day)
-
-    def parse_date_value(raw_value, raw_day: str | None) -> date_type:
-        resolved_date = None
-        if isinstance(raw_value, datetime_type):
-            resolved_date = raw_value.date()
-        elif isinstance(raw_value, date_type):
-            resolved_date = raw_value
-
-        if target_year is not None and target_month is not None:
-            day_number = None
-            if raw_day:
-                try:
-                    day_number = int(str(raw_day).strip())
-                except Exception:
-                    day_number = None
-
-            if day_number is None:
-                if resolved_date is not None:
-                    day_number = resolved_date.day
-                elif not raw_value:
-                    raise ValueError("Either date or day is required")
-                else:
-                    parsed = date_type.fromisoformat(str(raw_value).strip())
-                    day_number = parsed.day
-
-            return date_type(target_year, target_month, day_number)
-
-        if resolved_date is not None:
-            return resolved_date
-
-        if not raw_value:
-            raise ValueError("Date is required")
-        return date_type.fromisoformat(str(raw_value).strip())
-
-    rows: list[dict] = []
-    if filename.endswith(".csv"):
-        text = file_bytes.decode("utf-8-sig", errors="ignore")
-        reader = csv.DictReader(io.StringIO(text))
-        for row in reader:
-            rows.append({normalize_header(k): (v.strip() if isinstance(v, str) else v) for k, v in (row or {}).items()})
-    else:
-        try:
-            from openpyxl import load_workbook
-        except Exception:
-            raise HTTPException(status_code=500, detail="Excel upload requires openpyxl package")
-
-        wb = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
-        ws = wb.active
-        all_rows = list(ws.iter_rows(values_only=True))
-        if not all_rows:
-            raise HTTPException(status_code=400, detail="Excel file is empty")
-
-        headers = [normalize_header(h) for h in all_rows[0]]
-        for r in all_rows[1:]:
-            if not any(cell is not None and str(cell).strip() for cell in r):
-                continue
-            mapped = {}
-            for idx, value in enumerate(r):
-                key = headers[idx] if idx < len(headers) else f"col_{idx}"
-                mapped[key] = str(value).strip() if value is not None else ""
-            rows.append(mapped)
-
-    if not rows:
-        raise HTTPException(status_code=400, detail="No data rows found in file")
+    file.file.seek(0)
 
     created = 0
     updated = 0
     failed = 0
     errors = []
 
-    for idx, row in enumerate(rows, start=2):
+    today = date_type.today()
+    parsed_rows = []
+    has_rows = False
+    for idx, row in enumerate(_iter_upload_rows(file.file, filename), start=2):
+        has_rows = True
         try:
             name = row.get("name") or row.get("holiday_name") or ""
             day = row.get("day")
             raw_date = row.get("date")
-            holiday_date = parse_date_value(raw_date, day)
-            if holiday_date < date_type.today():
+            holiday_date = _parse_date_value(raw_date, day, target_year, target_month)
+            if holiday_date < today:
                 raise ValueError("Past dates are not allowed")
 
-            holiday_type = parse_type(row.get("type"))
+            holiday_type = _parse_type(row.get("type"))
             department = row.get("department") or "All"
-            repeat_yearly = parse_bool(row.get("repeat_yearly"))
+            repeat_yearly = _parse_bool(row.get("repeat_yearly"))
 
             if not name:
                 raise ValueError("Holiday name is required")
 
-            existing = db.query(Holiday).filter(
-                Holiday.name == name,
-                Holiday.date == holiday_date,
-                Holiday.department == department
-            ).first()
+            parsed_rows.append((idx, name, holiday_date, holiday_type, department, repeat_yearly))
+        except Exception as exc:
+            failed += 1
+            errors.append(f"Row {idx}: {exc}")
+
+    if not has_rows:
+        raise HTTPException(status_code=400, detail="No data rows found in file")
+
+    # One lookup for every (name, date, department) in the file instead of one per row.
+    existing_map = {}
+    keys = list({(name, holiday_date, department) for _, name, holiday_date, _, department, _ in parsed_rows})
+    if keys:
+        existing_rows = db.query(Holiday).filter(
+            tuple_(Holiday.name, Holiday.date, Holiday.department).in_(keys)
+        ).all()
+        existing_map = {(h.name, h.date, h.department): h for h in existing_rows}
+
+    # Collect inserts/updates first so the whole upload is written in one transaction.
+    to_insert: dict[tuple, HolidayCreate] = {}
+    to_update: dict[int, dict] = {}
+    for idx, name, holiday_date, holiday_type, department, repeat_yearly in parsed_rows:
+        try:
+            key = (name, holiday_date, department)
+            existing = existing_map.get(key)
 
             if existing:
-                existing.type = holiday_type
-                existing.repeat_yearly = repeat_yearly
-                holiday_service.update_holiday(
-                    db,
-                    existing.id,
-                    HolidayUpdate(
-                        name=existing.name,
-                        date=existing.date,
-                        type=existing.type,
-                        department=existing.department,
-                        repeat_yearly=existing.repeat_yearly
-                    )
+                to_update[existing.id] = {
+                    "id": existing.id,
+                    "type": holiday_type,
+                    "repeat_yearly": repeat_yearly,
+                }
+                updated += 1
+            elif key in to_insert:
+                # Repeated row in the same file: last one wins, as with existing holidays.
+                to_insert[key] = to_insert[key].model_copy(
+                    update={"type": holiday_type, "repeat_yearly": repeat_yearly}
                 )
                 updated += 1
             else:
-                holiday_service.create_holiday(
-                    db,
-                    HolidayCreate(
-                        name=name,
-                        date=holiday_date,
-                        type=holiday_type,
-                        department=department,
-                        repeat_yearly=repeat_yearly
-                    )
+                to_insert[key] = HolidayCreate(
+                    name=name,
+                    date=holiday_date,
+                    type=holiday_type,
+                    department=department,
+                    repeat_yearly=repeat_yearly
                 )
-                latest_holiday = db.query(Holiday).filter(
-                    Holiday.name == name,
-                    Holiday.date == holiday_date,
-                    Holiday.department == department
-                ).order_by(Holiday.id.desc()).first()
-                if latest_holiday:
-                    notify_all_employees(
-                        db,
-                        title="New holiday added",
-                        message=f"Holiday declared on {latest_holiday.date}: {latest_holiday.name}",
-                        event_type="holiday_added",
-                        reference_type="holiday",
-                        reference_id=latest_holiday.id,
-                        created_by=getattr(current_user, "id", None)
-                    )
                 created += 1
 
         except Exception as exc:
             failed += 1
             errors.append(f"Row {idx}: {exc}")
 
-    ensure_tomorrow_holiday_notifications(db)
+    try:
+        new_holidays = holiday_service.bulk_upsert_holidays(
+            db,
+            list(to_insert.values()),
+            list(to_update.values()),
+        )
+    except Exception:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to save uploaded holidays")
+
+    if new_holidays:
+        background_tasks.add_task(
+            run_with_new_session,
+            notify_holidays_added,
+            holidays=[{"id": h.id, "name": h.name, "date": h.date} for h in new_holidays],
+            created_by=getattr(current_user, "id", None)
+        )
+
+    background_tasks.add_task(run_with_new_session, ensure_tomorrow_holiday_notifications)
     return {
         "message": "Bulk upload processed",
         "created": created,
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import inspect, text
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import inspect, select, text
 from datetime import datetime, timezone
 
 from app.database.session import get_db
 from app.models.leave import Leave
-from app.schemas.leave import LeaveCreate, LeaveOut
+from app.schemas.leave import LeaveCreate, LeaveOut, LeaveOutList
 from app.core.dependencies import get_current_user, get_current_admin
 from app.models.user import User
-from app.services.notification_service import push_notification, notify_all_admins
+from app.services.notification_service import push_notification, notify_all_admins, run_with_new_session
 from app.services.attendance_service import enforce_hourly_leave_window, notify_attendance_state_change
 
 router = APIRouter(prefix="/leaves", tags=["Leaves"])
@@ -32,12 +33,31 @@ def ensure_leave_schema(db: Session) -> None:
             db.rollback()
 
 
+def _leave_load_options():
+    # LeaveOut nests both users; load them with the list instead of per row,
+    # and fail loudly on any other lazy load.
+    return (
+        joinedload(Leave.employee),
+        joinedload(Leave.approver),
+        raiseload("*", sql_only=True),
+    )
+
+
+def _leave_list_response(leaves) -> ORJSONResponse:
+    # Validated and dumped in one TypeAdapter pass; returning the response
+    # directly skips FastAPI's per-item response_model re-validation.
+    return ORJSONResponse(
+        LeaveOutList.dump_python(LeaveOutList.validate_python(leaves, from_attributes=True))
+    )
+
+
 # ======================================
 # EMPLOYEE APPLY LEAVE
 # ======================================
 @router.post("/", response_model=LeaveOut)
 def apply_leave(
     payload: LeaveCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -70,8 +90,9 @@ def apply_leave(
     db.commit()
     db.refresh(leave)
 
-    notify_all_admins(
-        db,
+    background_tasks.add_task(
+        run_with_new_session,
+        notify_all_admins,
         title="New leave request",
         message=f"{current_user.name} requested {leave.leave_type} leave from {leave.start_date} to {leave.end_date}.",
         event_type="leave_request_submitted",
@@ -86,15 +107,16 @@ def apply_leave(
 # ======================================
 # EMPLOYEE VIEW OWN LEAVES
 # ======================================
-@router.get("/my", response_model=list[LeaveOut])
+@router.get("/my", response_model=list[LeaveOut], response_class=ORJSONResponse)
 def get_my_leaves(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     ensure_leave_schema(db)
-    return db.query(Leave).filter(
+    stmt = select(Leave).options(*_leave_load_options()).where(
         Leave.user_id == current_user.id
-    ).order_by(Leave.created_at.desc()).all()
+    ).order_by(Leave.created_at.desc())
+    return _leave_list_response(db.scalars(stmt).all())
 
 
 @router.delete("/my/{leave_id}")
@@ -104,10 +126,11 @@ def delete_my_pending_leave(
     current_user: User = Depends(get_current_user)
 ):
     ensure_leave_schema(db)
-    leave = db.query(Leave).filter(
+    stmt = select(Leave).where(
         Leave.id == leave_id,
         Leave.user_id == current_user.id
-    ).first()
+    )
+    leave = db.execute(stmt).scalar_one_or_none()
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave request not found")
@@ -122,17 +145,17 @@ def delete_my_pending_leave(
 # ======================================
 # ADMIN VIEW ALL LEAVES
 # ======================================
-@router.get("/", response_model=list[LeaveOut])
+@router.get("/", response_model=list[LeaveOut], response_class=ORJSONResponse)
 def get_all_leaves(
     status: str | None = Query(default=None),
     db: Session = Depends(get_db),
     admin=Depends(get_current_admin)
 ):
     ensure_leave_schema(db)
-    query = db.query(Leave)
+    stmt = select(Leave).options(*_leave_load_options())
     if status:
-        query = query.filter(Leave.status == status)
-    return query.order_by(Leave.created_at.desc()).all()
+        stmt = stmt.where(Leave.status == status)
+    return _leave_list_response(db.scalars(stmt.order_by(Leave.created_at.desc())).all())
 
 
 # ======================================
@@ -141,11 +164,12 @@ def get_all_leaves(
 @router.put("/{leave_id}/approve")
 def approve_leave(
     leave_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
     ensure_leave_schema(db)
-    leave = db.query(Leave).filter(Leave.id == leave_id).first()
+    leave = db.get(Leave, leave_id)
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
@@ -159,8 +183,9 @@ def approve_leave(
     db.commit()
     enforce_hourly_leave_window(leave.user_id, db)
     notify_attendance_state_change(leave.user_id)
-    push_notification(
-        db,
+    background_tasks.add_task(
+        run_with_new_session,
+        push_notification,
         user_id=leave.user_id,
         title="Leave request approved",
         message=f"Your {leave.leave_type} leave from {leave.start_date} to {leave.end_date} has been approved.",
@@ -179,11 +204,12 @@ def approve_leave(
 @router.put("/{leave_id}/reject")
 def reject_leave(
     leave_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
     ensure_leave_schema(db)
-    leave = db.query(Leave).filter(Leave.id == leave_id).first()
+    leave = db.get(Leave, leave_id)
 
     if not leave:
         raise HTTPException(status_code=404, detail="Leave not found")
@@ -197,8 +223,9 @@ def reject_leave(
     db.commit()
     enforce_hourly_leave_window(leave.user_id, db)
     notify_attendance_state_change(leave.user_id)
-    push_notification(
-        db,
+    background_tasks.add_task(
+        run_with_new_session,
+        push_notification,
         user_id=leave.user_id,
         title="Leave request rejected",
         message=f"Your {leave.leave_type} leave from {leave.start_date} to {leave.end_date} has been rejected.",
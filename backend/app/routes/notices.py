@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
@@ -48,7 +49,7 @@ def create_notice(
 # -----------------------------
 # Admin + Employee: Get Notices
 # -----------------------------
-@router.get("/", response_model=List[NoticeResponse])
+@router.get("/", response_model=List[NoticeResponse], response_class=ORJSONResponse)
 def get_notices(
     db: Session = Depends(get_db),
     user=Depends(get_current_user)
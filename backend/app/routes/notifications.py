@@ -1,15 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_current_user
 from app.database.session import get_db
 from app.models.notification import Notification
 from app.models.user import User
-from app.schemas.notification import NotificationOut
-from app.services.notification_service import ensure_tomorrow_holiday_notifications
+from app.schemas.notification import NotificationOut, NotificationOutList
+from app.services.notification_service import maybe_ensure_tomorrow_holiday_notifications
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+# The badge renders anything above 99 as "99+", so there is no need to count further.
+UNREAD_COUNT_CAP = 100
+
 
 @router.get("/my", response_model=list[NotificationOut])
 def get_my_notifications(
@@ -19,12 +24,15 @@ def get_my_notifications(
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role == "employee":
-        ensure_tomorrow_holiday_notifications(db)
+        maybe_ensure_tomorrow_holiday_notifications(db)
 
     query = db.query(Notification).filter(Notification.user_id == current_user.id)
     if unread_only:
         query = query.filter(Notification.is_read == False)
-    return query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit).all()
+    notifications = query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit).all()
+    return ORJSONResponse(
+        NotificationOutList.dump_python(NotificationOutList.validate_python(notifications, from_attributes=True))
+    )
 
 
 @router.get("/unread-count")
@@ -33,12 +41,13 @@ def get_unread_notification_count(
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role == "employee":
-        ensure_tomorrow_holiday_notifications(db)
+        maybe_ensure_tomorrow_holiday_notifications(db)
 
-    count = db.query(Notification).filter(
+    unread_ids = select(Notification.id).where(
         Notification.user_id == current_user.id,
         Notification.is_read == False
-    ).count()
+    ).limit(UNREAD_COUNT_CAP).subquery()
+    count = db.query(func.count()).select_from(unread_ids).scalar()
     return {"unread_count": count}
 
 
@@ -48,15 +57,22 @@ def mark_notification_read(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-
-    if not notification.is_read:
-        notification.is_read = True
+    result = db.execute(
+        update(Notification).where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id,
+            Notification.is_read == False
+        ).values(is_read=True).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        # Nothing updated: either already read or not this user's notification.
+        exists = db.query(Notification.id).filter(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id
+        ).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Notification not found")
+    else:
         db.commit()
 
     return {"message": "Notification marked as read"}
@@ -91,13 +107,14 @@ def delete_notification(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
-    if not notification:
+    result = db.execute(
+        delete(Notification).where(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id
+        ).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    db.delete(notification)
     db.commit()
     return {"message": "Notification deleted"}
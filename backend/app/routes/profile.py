@@ -1,6 +1,7 @@
 # backend/app/routes/profile.py
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.database.session import get_db
 from app.core.dependencies import get_current_user
@@ -8,7 +9,6 @@ from app.core.security import verify_password, hash_password
 from app.models.user import User
 from app.schemas.user import ProfileUpdateSchema, ProfileResponse
 from fastapi import UploadFile, File
-import shutil
 import os
 import uuid
 
@@ -16,15 +16,27 @@ from fastapi import UploadFile, File, HTTPException
 
 
 UPLOAD_DIR = "uploads/profile_images"
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/webp"})
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
 
+def _sniff_image_extension(header: bytes) -> str | None:
+    """File extension from the image's magic bytes; the client's filename is not trusted."""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
 # ---------------- GET PROFILE ----------------
-@router.get("/", response_model=ProfileResponse)
+@router.get("/", response_model=ProfileResponse, response_class=ORJSONResponse)
 def get_profile(
     current_user: User = Depends(get_current_user)
 ):
-    return current_user
+    return ORJSONResponse(ProfileResponse.model_validate(current_user).model_dump())
 
 
 # ---------------- UPDATE PROFILE ----------------
@@ -50,7 +62,6 @@ def update_profile(
         setattr(current_user, field, value)
 
     db.commit()
-    db.refresh(current_user)
 
     return {"message": "Profile updated successfully"}
 
@@ -63,31 +74,37 @@ def upload_profile_image(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    allowed_types = ["image/jpeg", "image/png", "image/webp"]
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid file type")
 
-    if file.content_type not in allowed_types:
+    extension = _sniff_image_extension(file.file.read(12))
+    if extension is None:
         raise HTTPException(status_code=400, detail="Invalid file type")
+    file.file.seek(0)
 
     MAX_FILE_SIZE = 2 * 1024 * 1024
-    contents = file.file.read()
-
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large")
-
-    file.file.seek(0)
+    CHUNK_SIZE = 64 * 1024
 
     os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-    extension = file.filename.split(".")[-1]
     unique_filename = f"{current_user.id}_{uuid.uuid4().hex}.{extension}"
     file_path = os.path.join(UPLOAD_DIR, unique_filename)
 
+    # Single pass: copy in chunks and enforce the size limit as we go.
+    total_size = 0
     with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+        while chunk := file.file.read(CHUNK_SIZE):
+            total_size += len(chunk)
+            if total_size > MAX_FILE_SIZE:
+                break
+            buffer.write(chunk)
+
+    if total_size > MAX_FILE_SIZE:
+        os.remove(file_path)
+        raise HTTPException(status_code=400, detail="File too large")
 
     current_user.profile_image = file_path
     db.commit()
-    db.refresh(current_user)
 
     return {
         "message": "Image uploaded successfully",
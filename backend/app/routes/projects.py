@@ -1,56 +1,57 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List
-from app.models.user import User
 from fastapi import HTTPException
-from datetime import datetime, timezone
 from app.models.task import Task
-from app.schemas.task import TaskOut
+from app.schemas.task import TaskOut, TaskOutList
 from app.database.session import get_db
-from app.models.project import Project
+from app.models.project import Project, project_team_members
 from app.schemas.project import ProjectCreate, ProjectOut
 from app.core.dependencies import get_current_admin
 from app.services.notification_service import push_notifications
-from app.core.validation import require_employee_exists, require_non_empty_list, require_non_empty_text
+from app.services.project_service import get_project_stats, project_load_options, serialize_project
+from app.core.validation import (
+    get_active_employees,
+    require_active_employees,
+    require_non_empty_list,
+    require_non_empty_text,
+)
 
 
 
 router = APIRouter(prefix="/admin/projects", tags=["Projects"])
 
 
-def serialize_project(project: Project):
-    tasks = project.tasks or []
-    task_count = len(tasks)
-    completed_count = len([t for t in tasks if t.status == "completed"])
-    project_progress = int(round((completed_count / task_count) * 100)) if task_count else 0
-
-    now = datetime.now(timezone.utc)
-    total_seconds = 0
-    for task in tasks:
-        for log in (task.time_logs or []):
-            if not log.start_time:
-                continue
-            end_time = log.end_time or now
-            if end_time > log.start_time:
-                total_seconds += int((end_time - log.start_time).total_seconds())
-
-    return {
-        "id": project.id,
-        "name": project.name,
-        "description": project.description,
-        "start_date": project.start_date,
-        "end_date": project.end_date,
-        "status": project.status,
-        "created_by": project.created_by,
-        "owner_id": project.owner_id,
-        "created_at": project.created_at,
-        "owner": project.owner,
-        "team_members": project.team_members or [],
-        "tasks": tasks,
-        "task_count": task_count,
-        "project_progress": project_progress,
-        "total_hours": round(total_seconds / 3600, 1),
-    }
+def _current_member_ids(db: Session, project_id: int) -> set:
+    return set(
+        db.scalars(
+            select(project_team_members.c.user_id).where(project_team_members.c.project_id == project_id)
+        )
+    )
+
+
+def _add_team_members(db: Session, project_id: int, user_ids) -> None:
+    # One multi-row INSERT instead of a flush per appended member.
+    if not user_ids:
+        return
+    db.execute(
+        insert(project_team_members),
+        [{"project_id": project_id, "user_id": uid} for uid in sorted(user_ids)],
+    )
+
+
+def _remove_team_members(db: Session, project_id: int, user_ids) -> None:
+    if not user_ids:
+        return
+    db.execute(
+        delete(project_team_members).where(
+            project_team_members.c.project_id == project_id,
+            project_team_members.c.user_id.in_(user_ids),
+        )
+    )
+
 
 @router.post("/", response_model=ProjectOut)
 def create_project(
@@ -63,7 +64,16 @@ def create_project(
     if data.end_date < data.start_date:
         raise HTTPException(status_code=400, detail="Project end date cannot be before start date")
 
-    owner = require_employee_exists(db, int(data.owner_id), detail="Project owner not found")
+    owner_id = int(data.owner_id)
+    member_ids = sorted({int(uid) for uid in (data.team_members or []) if int(uid) > 0})
+    # Owner and members in one lookup.
+    employees = get_active_employees(db, [owner_id, *member_ids])
+    owner = employees.get(owner_id)
+    if not owner:
+        raise HTTPException(status_code=404, detail="Project owner not found")
+    if any(uid not in employees for uid in member_ids):
+        raise HTTPException(status_code=400, detail="One or more team members are invalid")
+
     project = Project(
         name=data.name,
         description=data.description,
@@ -73,29 +83,13 @@ def create_project(
         owner_id=data.owner_id
     )
 
-    project.team_members.append(owner)
-
-    member_ids = sorted({int(uid) for uid in (data.team_members or []) if int(uid) > 0})
-    if member_ids:
-        users = db.query(User).filter(
-            User.id.in_(member_ids),
-            User.role == "employee",
-            User.is_active == True,  # noqa: E712
-        ).all()
-        if len(users) != len(member_ids):
-            raise HTTPException(status_code=400, detail="One or more team members are invalid")
-        for user in users:
-            if user.id != data.owner_id:
-                project.team_members.append(user)
-
-    if not project.team_members:
-        raise HTTPException(status_code=400, detail="Please select at least one employee.")
-
     db.add(project)
+    db.flush()
+    _add_team_members(db, project.id, {owner_id, *member_ids})
     db.commit()
     db.refresh(project)
 
-    assigned_user_ids = [member.id for member in (project.team_members or []) if member.role == "employee"]
+    assigned_user_ids = sorted({owner_id, *member_ids})
     push_notifications(
         db,
         user_ids=assigned_user_ids,
@@ -111,13 +105,14 @@ def create_project(
 
 
 
-@router.get("/", response_model=List[ProjectOut])
+@router.get("/", response_model=List[ProjectOut], response_class=ORJSONResponse)
 def get_projects(
     db: Session = Depends(get_db),
     admin = Depends(get_current_admin)
 ):
-    projects = db.query(Project).order_by(Project.created_at.desc()).all()
-    return [serialize_project(project) for project in projects]
+    projects = db.query(Project).options(*project_load_options()).order_by(Project.created_at.desc()).all()
+    stats = get_project_stats(db, [project.id for project in projects])
+    return [serialize_project(project, stats[project.id]) for project in projects]
 
 
 @router.post("/{project_id}/team")
@@ -137,19 +132,13 @@ def assign_team_members(
     if not unique_user_ids:
         raise HTTPException(status_code=400, detail="Please select at least one employee.")
 
-    old_member_ids = {member.id for member in (project.team_members or [])}
-    users = db.query(User).filter(
-        User.id.in_(unique_user_ids),
-        User.role == "employee",
-        User.is_active == True,  # noqa: E712
-    ).all()
-    if len(users) != len(unique_user_ids):
-        raise HTTPException(status_code=400, detail="One or more team members are invalid")
-    project.team_members = users
+    old_member_ids = _current_member_ids(db, project.id)
+    new_member_ids = set(require_active_employees(db, unique_user_ids))
+    added_member_ids = sorted(new_member_ids - old_member_ids)
+    _remove_team_members(db, project.id, old_member_ids - new_member_ids)
+    _add_team_members(db, project.id, added_member_ids)
 
     db.commit()
-    new_member_ids = {member.id for member in users}
-    added_member_ids = sorted(new_member_ids - old_member_ids)
     push_notifications(
         db,
         user_ids=added_member_ids,
@@ -165,32 +154,39 @@ def assign_team_members(
 from app.core.dependencies import get_current_user
 
 
-@router.get("/{project_id}/tasks", response_model=List[TaskOut])
+@router.get("/{project_id}/tasks", response_model=List[TaskOut], response_class=ORJSONResponse)
 def get_project_tasks_admin(
     project_id: int,
     db: Session = Depends(get_db),
     admin = Depends(get_current_admin)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(
+        selectinload(Project.tasks).options(
+            joinedload(Task.assigned_user),
+            joinedload(Task.created_user),
+        )
+    ).filter(Project.id == project_id).first()
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return project.tasks
+    return ORJSONResponse(
+        TaskOutList.dump_python(TaskOutList.validate_python(project.tasks, from_attributes=True))
+    )
 
 
-@router.get("/{project_id}", response_model=ProjectOut)
+@router.get("/{project_id}", response_model=ProjectOut, response_class=ORJSONResponse)
 def get_project_detail(
     project_id: int,
     db: Session = Depends(get_db),
     admin = Depends(get_current_admin)
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(*project_load_options()).filter(Project.id == project_id).first()
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    return serialize_project(project)
+    return serialize_project(project, get_project_stats(db, [project.id])[project.id])
 
 
 @router.put("/{project_id}", response_model=ProjectOut)
@@ -209,9 +205,15 @@ def update_project(
     if data.end_date < data.start_date:
         raise HTTPException(status_code=400, detail="Project end date cannot be before start date")
 
-    owner = require_employee_exists(db, int(data.owner_id), detail="Project owner not found")
-
-    old_member_ids = {member.id for member in (project.team_members or []) if member.role == "employee"}
+    owner_id = int(data.owner_id)
+    member_ids = sorted({int(uid) for uid in (data.team_members or []) if int(uid) > 0})
+    # Owner and members in one lookup.
+    employees = get_active_employees(db, [owner_id, *member_ids])
+    owner = employees.get(owner_id)
+    if not owner:
+        raise HTTPException(status_code=404, detail="Project owner not found")
+    if any(uid not in employees for uid in member_ids):
+        raise HTTPException(status_code=400, detail="One or more team members are invalid")
 
     project.name = data.name
     project.description = data.description
@@ -219,27 +221,16 @@ def update_project(
     project.end_date = data.end_date
     project.owner_id = data.owner_id
 
-    member_ids = sorted({int(uid) for uid in (data.team_members or []) if int(uid) > 0})
-    users = []
-    if member_ids:
-        users = db.query(User).filter(
-            User.id.in_(member_ids),
-            User.role == "employee",
-            User.is_active == True,  # noqa: E712
-        ).all()
-        if len(users) != len(member_ids):
-            raise HTTPException(status_code=400, detail="One or more team members are invalid")
-
-    team_by_id = {owner.id: owner}
-    for user in users:
-        team_by_id[user.id] = user
-    project.team_members = list(team_by_id.values())
+    # Apply only the membership delta so unchanged members are left alone.
+    desired_ids = {owner_id, *member_ids}
+    current_ids = _current_member_ids(db, project.id)
+    added_member_ids = sorted(desired_ids - current_ids)
+    _add_team_members(db, project.id, added_member_ids)
+    _remove_team_members(db, project.id, current_ids - desired_ids)
 
     db.commit()
-    db.refresh(project)
+    project = db.query(Project).options(*project_load_options()).filter(Project.id == project_id).one()
 
-    new_member_ids = {member.id for member in (project.team_members or []) if member.role == "employee"}
-    added_member_ids = sorted(new_member_ids - old_member_ids)
     push_notifications(
         db,
         user_ids=added_member_ids,
@@ -251,7 +242,7 @@ def update_project(
         created_by=admin.id
     )
 
-    return serialize_project(project)
+    return serialize_project(project, get_project_stats(db, [project.id])[project.id])
 
 
 @router.delete("/{project_id}")
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import and_, delete, func, insert, inspect, literal, or_, select, text, union, update
+from sqlalchemy.orm import Session, defer
 from typing import List
 
 from app.database.session import get_db
 from app.core.dependencies import get_current_user, get_current_admin
+from app.core.ttl_cache import TTLCache
 from app.models.user import User
 from app.models.research import (
     ResearchFile,
@@ -20,6 +23,80 @@ from app.services.notification_service import notify_all_employees, push_notific
 
 router = APIRouter(prefix="/research", tags=["Research"])
 
+# Per (user_id, file_id) column grants: {column_id: (can_view, can_edit)},
+# tagged with the ResearchFile.version they were read at. Permission and
+# column writes bump the version, so an entry from before a write is not
+# reused on any worker; the local clear just frees it sooner.
+_column_perm_cache = TTLCache(ttl_seconds=60, max_entries=10_000)
+
+
+def _get_column_permissions(
+    db: Session, user_id: int, file_id: int, version: int
+) -> dict[int, tuple[bool, bool]]:
+    key = (user_id, file_id)
+    perms = _column_perm_cache.get(key, version=version)
+    if perms is not None:
+        return perms
+
+    perms = {
+        column_id: (bool(can_view), bool(can_edit))
+        for column_id, can_view, can_edit in db.query(
+            ResearchColumnPermission.column_id,
+            ResearchColumnPermission.can_view,
+            ResearchColumnPermission.can_edit,
+        ).join(ResearchColumn, ResearchColumn.id == ResearchColumnPermission.column_id).filter(
+            ResearchColumnPermission.user_id == user_id,
+            ResearchColumn.file_id == file_id
+        )
+    }
+    _column_perm_cache.set(key, perms, version=version)
+    return perms
+
+
+def _invalidate_column_permissions(file_id: int) -> None:
+    _column_perm_cache.invalidate_where(lambda key: key[1] == file_id)
+
+
+# Rendered get_file_detail bodies per (file_id, user_id), tagged with the
+# ResearchFile.version they were built from. Writes bump the version in the
+# same transaction, and the column permissions a body is rendered from are
+# checked against that same version, so a body from before a write is not
+# served on any worker; the TTL only bounds memory held for idle files.
+_file_detail_cache = TTLCache(ttl_seconds=60, max_entries=256)
+
+
+def ensure_research_schema(db: Session) -> None:
+    inspector = inspect(db.bind)
+    existing_cols = {c["name"] for c in inspector.get_columns("research_files")}
+    if "version" in existing_cols:
+        return
+    try:
+        db.execute(text("ALTER TABLE research_files ADD COLUMN version INTEGER DEFAULT 0 NOT NULL"))
+        db.commit()
+    except Exception:
+        db.rollback()
+
+
+def _bump_file_version(db: Session, file_id: int) -> None:
+    db.execute(
+        update(ResearchFile).where(ResearchFile.id == file_id).values(version=ResearchFile.version + 1),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def _cached_file_detail(key: tuple[int, int], version: int):
+    body = _file_detail_cache.get(key, version=version)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    return None
+
+
+def _file_detail_response(key: tuple[int, int], version: int, payload: dict) -> ORJSONResponse:
+    response = ORJSONResponse(payload)
+    _file_detail_cache.set(key, response.body, version=version)
+    return response
+
+
 @router.post("/files", response_model=ResearchFileOut)
 def create_file(
     payload: ResearchFileCreate,
@@ -44,34 +121,29 @@ def create_file(
         if not payload.rows or not payload.columns:
             raise HTTPException(status_code=400, detail="Rows and columns required")
 
-        columns = []
-        for i in range(payload.columns):
-            col = ResearchColumn(
-                file_id=file.id,
-                column_name=f"Column {i+1}",
-                column_order=i+1
-            )
-            db.add(col)
-            columns.append(col)
-
-        db.commit()
-
-        for r in range(payload.rows):
-            row = ResearchRow(
-                file_id=file.id,
-                row_number=r+1
-            )
-            db.add(row)
-            db.commit()
-            db.refresh(row)
-
-            for col in columns:
-                cell = ResearchCell(
-                    row_id=row.id,
-                    column_id=col.id,
-                    value=""
-                )
-                db.add(cell)
+        # Three multi-row INSERTs (columns, rows, cells) and one commit,
+        # instead of a commit per row and an INSERT per cell.
+        column_ids = db.scalars(
+            insert(ResearchColumn).returning(ResearchColumn.id, sort_by_parameter_order=True),
+            [
+                {"file_id": file.id, "column_name": f"Column {i+1}", "column_order": i+1}
+                for i in range(payload.columns)
+            ]
+        ).all()
+
+        row_ids = db.scalars(
+            insert(ResearchRow).returning(ResearchRow.id, sort_by_parameter_order=True),
+            [{"file_id": file.id, "row_number": r+1} for r in range(payload.rows)]
+        ).all()
+
+        db.execute(
+            insert(ResearchCell),
+            [
+                {"row_id": row_id, "column_id": column_id, "value": ""}
+                for row_id in row_ids
+                for column_id in column_ids
+            ]
+        )
 
         db.commit()
 
@@ -136,43 +208,44 @@ def get_files(
     if user.role == "admin":
         return db.query(ResearchFile).all()
 
-    # Employee: collect file IDs accessible via column or document permissions
-    accessible_ids = set()
-
+    # Employee: file IDs accessible via column or document permissions, resolved in one query
     # 1. Excel files: any column where employee has can_view
-    col_perms = db.query(ResearchColumnPermission).filter(
+    column_file_ids = select(ResearchColumn.file_id).join(
+        ResearchColumnPermission,
+        ResearchColumnPermission.column_id == ResearchColumn.id
+    ).where(
         ResearchColumnPermission.user_id == user.id,
         ResearchColumnPermission.can_view == True
-    ).all()
-    for cp in col_perms:
-        col = db.query(ResearchColumn).filter(ResearchColumn.id == cp.column_id).first()
-        if col:
-            accessible_ids.add(col.file_id)
+    )
 
     # 2. Documents: visibility=everyone, or selected + employee has a permission record
-    for doc in db.query(ResearchDocument).all():
-        if doc.visibility == "everyone":
-            accessible_ids.add(doc.file_id)
-        elif doc.visibility == "selected":
-            dp = db.query(ResearchDocumentPermission).filter(
-                ResearchDocumentPermission.document_id == doc.id,
-                ResearchDocumentPermission.user_id == user.id
-            ).first()
-            if dp:
-                accessible_ids.add(doc.file_id)
-        # visibility == "admin" → never accessible to employees
-
-    if not accessible_ids:
-        return []
+    #    (visibility == "admin" → never accessible to employees)
+    document_file_ids = select(ResearchDocument.file_id).outerjoin(
+        ResearchDocumentPermission,
+        and_(
+            ResearchDocumentPermission.document_id == ResearchDocument.id,
+            ResearchDocumentPermission.user_id == user.id
+        )
+    ).where(
+        or_(
+            ResearchDocument.visibility == "everyone",
+            and_(
+                ResearchDocument.visibility == "selected",
+                ResearchDocumentPermission.id.isnot(None)
+            )
+        )
+    )
 
-    return db.query(ResearchFile).filter(ResearchFile.id.in_(accessible_ids)).all()
+    return db.query(ResearchFile).filter(
+        ResearchFile.id.in_(union(column_file_ids, document_file_ids))
+    ).all()
 
 
 # =========================
 # GET FILE DETAIL
 # CHANGED: added role, can_edit per cell/column, columns filtered for employees
 # =========================
-@router.get("/files/{file_id}")
+@router.get("/files/{file_id}", response_class=ORJSONResponse)
 def get_file_detail(
     file_id: int,
     db: Session = Depends(get_db),
@@ -183,88 +256,98 @@ def get_file_detail(
     if not file:
         raise HTTPException(status_code=404, detail="File not found")
 
+    cache_key = (file.id, user.id)
+    cached = _cached_file_detail(cache_key, file.version)
+    if cached is not None:
+        return cached
+
     # =========================
     # EXCEL FILE
     # =========================
     if file.type == "excel":
 
-        all_columns = db.query(ResearchColumn).filter(
+        # Role is decided once here; everything below only consults
+        # visible_columns / column_index.
+        columns_query = db.query(ResearchColumn.id, ResearchColumn.column_name).filter(
             ResearchColumn.file_id == file.id
-        ).order_by(ResearchColumn.column_order).all()
+        ).order_by(ResearchColumn.column_order)
+
+        is_admin = user.role == "admin"
+        if is_admin:
+            # Admin always has full access.
+            visible_columns = [
+                {"id": col.id, "name": col.column_name, "can_edit": True}
+                for col in columns_query
+            ]
+        else:
+            # Fail fast from the (cached) permission map before touching
+            # columns or rows.
+            col_perm_map = _get_column_permissions(db, user.id, file.id, file.version)
+            viewable_ids = [cid for cid, (can_view, _) in col_perm_map.items() if can_view]
+            if not viewable_ids:
+                raise HTTPException(status_code=403, detail="Access denied")
 
-        rows = db.query(ResearchRow).filter(
+            visible_columns = [
+                {"id": col.id, "name": col.column_name, "can_edit": col_perm_map[col.id][1]}
+                for col in columns_query.filter(ResearchColumn.id.in_(viewable_ids))
+            ]
+            if not visible_columns:
+                raise HTTPException(status_code=403, detail="Access denied")
+
+        # Rows are sent column-aligned: cell_ids[i] / values[i] belong to
+        # columns[i], and edit rights come from the column entry, so no
+        # per-cell dict is built.
+        column_index = {c["id"]: i for i, c in enumerate(visible_columns)}
+        column_count = len(visible_columns)
+
+        # Rows and their visible cells in one ordered JOIN, folded into
+        # result_rows as the stream goes past. The outer join keeps rows
+        # that have no visible cells.
+        cell_join = ResearchCell.row_id == ResearchRow.id
+        if not is_admin:
+            cell_join = and_(cell_join, ResearchCell.column_id.in_(list(column_index)))
+        sheet = db.query(
+            ResearchRow.id.label("row_id"),
+            ResearchRow.row_number,
+            ResearchCell.id.label("cell_id"),
+            ResearchCell.column_id,
+            ResearchCell.value,
+        ).outerjoin(ResearchCell, cell_join).filter(
             ResearchRow.file_id == file.id
-        ).order_by(ResearchRow.row_number).all()
-
-        # Build permission map for this employee: column_id → perm record
-        # Skipped entirely for admin (admin always has full access)
-        col_perm_map = {}
-        if user.role != "admin":
-            for p in db.query(ResearchColumnPermission).filter(
-                ResearchColumnPermission.user_id == user.id
-            ).all():
-                col_perm_map[p.column_id] = p
-
-        # Build visible columns list, each entry includes can_edit flag
-        visible_columns = []
-        for col in all_columns:
-            if user.role == "admin":
-                visible_columns.append({
-                    "id":       col.id,
-                    "name":     col.column_name,
-                    "can_edit": True
-                })
-            else:
-                perm = col_perm_map.get(col.id)
-                if perm and perm.can_view:
-                    visible_columns.append({
-                        "id":       col.id,
-                        "name":     col.column_name,
-                        "can_edit": bool(perm.can_edit)
-                    })
-
-        visible_col_ids = {c["id"] for c in visible_columns}
-        if user.role != "admin" and not visible_col_ids:
-            raise HTTPException(status_code=403, detail="Access denied")
+        ).order_by(ResearchRow.row_number, ResearchRow.id, ResearchCell.id)
 
         result_rows = []
-        for row in rows:
-            cells = db.query(ResearchCell).filter(
-                ResearchCell.row_id == row.id
-            ).all()
-
-            row_data = []
-            for cell in cells:
-                if cell.column_id not in visible_col_ids:
-                    continue
-
-                if user.role == "admin":
-                    can_edit = True
-                else:
-                    perm = col_perm_map.get(cell.column_id)
-                    can_edit = bool(perm and perm.can_edit)
-
-                row_data.append({
-                    "cell_id":   cell.id,
-                    "column_id": cell.column_id,
-                    "value":     cell.value,
-                    "can_edit":  can_edit
+        current_row_id = None
+        cell_ids = values = None
+        for rec in sheet:
+            if rec.row_id != current_row_id:
+                current_row_id = rec.row_id
+                cell_ids = [None] * column_count
+                values = [None] * column_count
+                result_rows.append({
+                    "row_id":     rec.row_id,
+                    "row_number": rec.row_number,
+                    "cell_ids":   cell_ids,
+                    "values":     values
                 })
 
-            result_rows.append({
-                "row_id":     row.id,
-                "row_number": row.row_number,
-                "cells":      row_data
-            })
+            index = column_index.get(rec.column_id)
+            if rec.cell_id is None or index is None:
+                continue
+
+            cell_ids[index] = rec.cell_id
+            values[index] = rec.value
 
-        return {
+        # Returned as a response object so the (potentially large) sheet skips
+        # jsonable_encoder and goes straight to orjson.
+        return _file_detail_response(cache_key, file.version, {
             "id":      file.id,
             "name":    file.name,
             "type":    file.type,
             "role":    user.role,
             "columns": visible_columns,
             "rows":    result_rows
-        }
+        })
 
     # =========================
     # DOCUMENT FILE
@@ -278,29 +361,24 @@ def get_file_detail(
         if not doc:
             raise HTTPException(status_code=404, detail="Document not found")
 
-        # Access control (unchanged)
-        if doc.visibility == "admin" and user.role != "admin":
-            raise HTTPException(status_code=403, detail="Access denied")
-
-        if doc.visibility == "selected" and user.role != "admin":
-            perm = db.query(ResearchDocumentPermission).filter(
-                ResearchDocumentPermission.document_id == doc.id,
-                ResearchDocumentPermission.user_id == user.id
-            ).first()
-            if not perm:
-                raise HTTPException(status_code=403, detail="Access denied")
-
-        # Determine edit permission
+        # Access control and edit permission from a single grant lookup.
         if user.role == "admin":
             can_edit_doc = True
         else:
-            doc_perm = db.query(ResearchDocumentPermission).filter(
-                ResearchDocumentPermission.document_id == doc.id,
-                ResearchDocumentPermission.user_id == user.id
-            ).first()
-            can_edit_doc = bool(doc_perm)
+            if doc.visibility == "admin":
+                raise HTTPException(status_code=403, detail="Access denied")
 
-        return {
+            has_grant = db.query(
+                select(ResearchDocumentPermission.id).where(
+                    ResearchDocumentPermission.document_id == doc.id,
+                    ResearchDocumentPermission.user_id == user.id
+                ).exists()
+            ).scalar()
+            if doc.visibility == "selected" and not has_grant:
+                raise HTTPException(status_code=403, detail="Access denied")
+            can_edit_doc = bool(has_grant)
+
+        return _file_detail_response(cache_key, file.version, {
             "id":         file.id,
             "name":       file.name,
             "type":       file.type,
@@ -310,7 +388,7 @@ def get_file_detail(
             "content":    doc.content,
             "visibility": doc.visibility,
             "can_edit":   can_edit_doc
-        }
+        })
 
 
 # =========================
@@ -331,28 +409,27 @@ def add_row(
     if file.type != "excel":
         raise HTTPException(status_code=400, detail="Not an excel file")
 
-    existing_rows = db.query(ResearchRow).filter(
+    next_number = db.query(func.coalesce(func.max(ResearchRow.row_number), 0)).filter(
         ResearchRow.file_id == file_id
-    ).order_by(ResearchRow.row_number.desc()).all()
-
-    next_number = (existing_rows[0].row_number + 1) if existing_rows else 1
+    ).scalar() + 1
 
     new_row = ResearchRow(
         file_id=file_id,
         row_number=next_number
     )
     db.add(new_row)
-    db.commit()
-    db.refresh(new_row)
-
-    columns = db.query(ResearchColumn).filter(ResearchColumn.file_id == file_id).all()
-    for col in columns:
-        cell = ResearchCell(
-            row_id=new_row.id,
-            column_id=col.id,
-            value=""
+    db.flush()
+
+    # One blank cell per column, written as a single INSERT ... SELECT.
+    db.execute(
+        insert(ResearchCell).from_select(
+            ["row_id", "column_id", "value"],
+            select(literal(new_row.id), ResearchColumn.id, literal("")).where(
+                ResearchColumn.file_id == file_id
+            )
         )
-        db.add(cell)
+    )
+    _bump_file_version(db, file_id)
 
     db.commit()
 
@@ -373,19 +450,22 @@ def delete_row(
         raise HTTPException(status_code=404, detail="Row not found")
 
     file_id = row.file_id
+    deleted_number = row.row_number
 
     # Delete row cells explicitly for DB engines where FK cascade may not be enforced.
     db.query(ResearchCell).filter(ResearchCell.row_id == row_id).delete()
     db.delete(row)
     db.flush()
 
-    # Keep row numbers contiguous after delete.
-    rows = db.query(ResearchRow).filter(
-        ResearchRow.file_id == file_id
-    ).order_by(ResearchRow.row_number.asc(), ResearchRow.id.asc()).all()
-
-    for index, r in enumerate(rows, start=1):
-        r.row_number = index
+    # Keep row numbers contiguous after delete: shift the tail up in one UPDATE.
+    db.execute(
+        update(ResearchRow).where(
+            ResearchRow.file_id == file_id,
+            ResearchRow.row_number > deleted_number
+        ).values(row_number=ResearchRow.row_number - 1),
+        execution_options={"synchronize_session": False}
+    )
+    _bump_file_version(db, file_id)
 
     db.commit()
     return {"message": "Row deleted", "file_id": file_id}
@@ -410,11 +490,9 @@ def add_column(
     if file.type != "excel":
         raise HTTPException(status_code=400, detail="Not an excel file")
 
-    existing_cols = db.query(ResearchColumn).filter(
+    next_order = db.query(func.coalesce(func.max(ResearchColumn.column_order), 0)).filter(
         ResearchColumn.file_id == file_id
-    ).order_by(ResearchColumn.column_order.desc()).all()
-
-    next_order = (existing_cols[0].column_order + 1) if existing_cols else 1
+    ).scalar() + 1
 
     col_name = payload.get("name") or f"Column {next_order}"
 
@@ -424,17 +502,18 @@ def add_column(
         column_order=next_order
     )
     db.add(new_col)
-    db.commit()
-    db.refresh(new_col)
-
-    rows = db.query(ResearchRow).filter(ResearchRow.file_id == file_id).all()
-    for row in rows:
-        cell = ResearchCell(
-            row_id=row.id,
-            column_id=new_col.id,
-            value=""
+    db.flush()
+
+    # One blank cell per row, written as a single INSERT ... SELECT.
+    db.execute(
+        insert(ResearchCell).from_select(
+            ["row_id", "column_id", "value"],
+            select(ResearchRow.id, literal(new_col.id), literal("")).where(
+                ResearchRow.file_id == file_id
+            )
         )
-        db.add(cell)
+    )
+    _bump_file_version(db, file_id)
 
     db.commit()
 
@@ -452,23 +531,25 @@ def update_cell(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user)
 ):
-    cell = db.query(ResearchCell).filter(ResearchCell.id == cell_id).first()
+    row = db.query(ResearchCell, ResearchColumn.file_id, ResearchFile.version).join(
+        ResearchColumn, ResearchColumn.id == ResearchCell.column_id
+    ).join(
+        ResearchFile, ResearchFile.id == ResearchColumn.file_id
+    ).filter(ResearchCell.id == cell_id).first()
 
-    if not cell:
+    if not row:
         raise HTTPException(status_code=404, detail="Cell not found")
+    cell, file_id, file_version = row
 
     if user.role != "admin":
-        permission = db.query(ResearchColumnPermission).filter(
-            ResearchColumnPermission.column_id == cell.column_id,
-            ResearchColumnPermission.user_id == user.id,
-            ResearchColumnPermission.can_edit == True
-        ).first()
-
-        if not permission:
+        perms = _get_column_permissions(db, user.id, file_id, file_version)
+        _, can_edit = perms.get(cell.column_id, (False, False))
+        if not can_edit:
             raise HTTPException(status_code=403, detail="No edit permission")
 
     cell.value = payload.value
     cell.updated_by = user.id
+    _bump_file_version(db, file_id)
 
     db.commit()
 
@@ -492,6 +573,7 @@ def update_column(
         raise HTTPException(status_code=404, detail="Column not found")
 
     column.column_name = payload.get("name", column.column_name)
+    _bump_file_version(db, column.file_id)
     db.commit()
 
     return {"message": "Column updated"}
@@ -512,32 +594,93 @@ def update_permissions(
     if not column:
         raise HTTPException(status_code=404, detail="Column not found")
 
-    db.query(ResearchColumnPermission).filter(
-        ResearchColumnPermission.column_id == column_id
-    ).delete()
-
     everyone = payload.get("everyone", False)
     if everyone:
-        employee_ids = db.query(User.id).filter(User.role == "employee").all()
-        for (user_id,) in employee_ids:
-            perm = ResearchColumnPermission(
-                column_id=column_id,
-                user_id=user_id,
-                can_view=True,
-                can_edit=True
-            )
-            db.add(perm)
-    else:
-        for user_id in set(payload.get("user_ids", [])):
-            perm = ResearchColumnPermission(
-                column_id=column_id,
-                user_id=user_id,
-                can_view=True,
-                can_edit=True
+        # Grant every employee server-side: no ids cross the wire.
+        employee_ids = select(User.id).where(User.role == "employee")
+        db.execute(
+            delete(ResearchColumnPermission).where(
+                ResearchColumnPermission.column_id == column_id,
+                ResearchColumnPermission.user_id.not_in(employee_ids)
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        db.execute(
+            update(ResearchColumnPermission).where(
+                ResearchColumnPermission.column_id == column_id,
+                or_(
+                    ResearchColumnPermission.can_view.isnot(True),
+                    ResearchColumnPermission.can_edit.isnot(True)
+                )
+            ).values(can_view=True, can_edit=True),
+            execution_options={"synchronize_session": False}
+        )
+        already_granted = select(ResearchColumnPermission.id).where(
+            ResearchColumnPermission.column_id == column_id,
+            ResearchColumnPermission.user_id == User.id
+        ).exists()
+        db.execute(
+            insert(ResearchColumnPermission).from_select(
+                ["column_id", "user_id", "can_view", "can_edit"],
+                select(literal(column_id), User.id, literal(True), literal(True)).where(
+                    User.role == "employee",
+                    ~already_granted
+                )
             )
-            db.add(perm)
+        )
+
+        file_id = column.file_id
+        _bump_file_version(db, file_id)
+        db.commit()
+        _invalidate_column_permissions(file_id)
+
+        return {"message": "Permissions updated"}
+
+    desired = {int(uid) for uid in payload.get("user_ids", [])}
+
+    # Apply only the difference so unchanged grants are not deleted and re-inserted.
+    current = set(db.scalars(
+        select(ResearchColumnPermission.user_id).where(ResearchColumnPermission.column_id == column_id)
+    ))
 
+    removed = current - desired
+    if removed:
+        db.execute(
+            delete(ResearchColumnPermission).where(
+                ResearchColumnPermission.column_id == column_id,
+                ResearchColumnPermission.user_id.in_(removed)
+            ),
+            execution_options={"synchronize_session": False}
+        )
+
+    kept = current & desired
+    if kept:
+        db.execute(
+            update(ResearchColumnPermission).where(
+                ResearchColumnPermission.column_id == column_id,
+                ResearchColumnPermission.user_id.in_(kept),
+                or_(
+                    ResearchColumnPermission.can_view.isnot(True),
+                    ResearchColumnPermission.can_edit.isnot(True)
+                )
+            ).values(can_view=True, can_edit=True),
+            execution_options={"synchronize_session": False}
+        )
+
+    added = desired - current
+    if added:
+        db.execute(
+            insert(ResearchColumnPermission),
+            [
+                {"column_id": column_id, "user_id": uid, "can_view": True, "can_edit": True}
+                for uid in sorted(added)
+            ]
+        )
+
+    file_id = column.file_id
+    _bump_file_version(db, file_id)
     db.commit()
+    _invalidate_column_permissions(file_id)
 
     return {"message": "Permissions updated"}
 
@@ -552,8 +695,13 @@ def delete_column(
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
+    file_id = db.scalar(select(ResearchColumn.file_id).where(ResearchColumn.id == column_id))
     db.query(ResearchColumn).filter(ResearchColumn.id == column_id).delete()
+    if file_id is not None:
+        _bump_file_version(db, file_id)
     db.commit()
+    if file_id is not None:
+        _invalidate_column_permissions(file_id)
 
     return {"message": "Column deleted"}
 
@@ -569,18 +717,23 @@ def update_document(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user)
 ):
-    doc = db.query(ResearchDocument).filter(ResearchDocument.id == document_id).first()
+    # content is only ever overwritten here, so don't fetch the (possibly large) body.
+    doc = db.query(ResearchDocument).options(defer(ResearchDocument.content)).filter(
+        ResearchDocument.id == document_id
+    ).first()
 
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
     # Only admin or permitted users can edit
     if user.role != "admin":
-        perm = db.query(ResearchDocumentPermission).filter(
-            ResearchDocumentPermission.document_id == doc.id,
-            ResearchDocumentPermission.user_id == user.id
-        ).first()
-        if not perm:
+        has_grant = db.query(
+            select(ResearchDocumentPermission.id).where(
+                ResearchDocumentPermission.document_id == doc.id,
+                ResearchDocumentPermission.user_id == user.id
+            ).exists()
+        ).scalar()
+        if not has_grant:
             raise HTTPException(status_code=403, detail="No edit permission")
 
     # title and content: both roles can update
@@ -591,34 +744,46 @@ def update_document(
         doc.content = payload["content"]
 
     # visibility and permission assignments: admin only
-    if user.role == "admin":
+    is_admin = user.role == "admin"
+    old_visibility = doc.visibility
+    if is_admin:
         if "visibility" in payload:
             doc.visibility = payload["visibility"]
 
     if hasattr(doc, "updated_by"):
         doc.updated_by = user.id
 
-    db.commit()
-
-    # Permission record management: admin only
-    if user.role == "admin":
-        if payload.get("visibility") == "selected":
-            db.query(ResearchDocumentPermission).filter(
-                ResearchDocumentPermission.document_id == doc.id
-            ).delete()
-            for uid in payload.get("user_ids", []):
-                dp = ResearchDocumentPermission(
-                    document_id=doc.id,
-                    user_id=uid
+    # Permission records are rewritten only when the assignment actually
+    # changes, and everything lands in a single commit.
+    selected_ids = None
+    if is_admin:
+        new_visibility = payload.get("visibility")
+        visibility_changed = new_visibility != old_visibility
+        if new_visibility == "selected" and (visibility_changed or "user_ids" in payload):
+            selected_ids = sorted({int(uid) for uid in payload.get("user_ids", [])})
+            db.execute(
+                delete(ResearchDocumentPermission).where(
+                    ResearchDocumentPermission.document_id == doc.id
+                ),
+                execution_options={"synchronize_session": False}
+            )
+            if selected_ids:
+                db.execute(
+                    insert(ResearchDocumentPermission),
+                    [{"document_id": doc.id, "user_id": uid} for uid in selected_ids]
                 )
-                db.add(dp)
-            db.commit()
-        elif payload.get("visibility") in ("everyone", "admin"):
-            db.query(ResearchDocumentPermission).filter(
-                ResearchDocumentPermission.document_id == doc.id
-            ).delete()
-            db.commit()
+        elif new_visibility in ("everyone", "admin") and visibility_changed:
+            db.execute(
+                delete(ResearchDocumentPermission).where(
+                    ResearchDocumentPermission.document_id == doc.id
+                ),
+                execution_options={"synchronize_session": False}
+            )
 
+    _bump_file_version(db, doc.file_id)
+    db.commit()
+
+    if is_admin:
         if doc.visibility == "everyone":
             notify_all_employees(
                 db,
@@ -630,11 +795,12 @@ def update_document(
                 created_by=user.id
             )
         elif doc.visibility == "selected":
-            selected_ids = [
-                uid for (uid,) in db.query(ResearchDocumentPermission.user_id).filter(
-                    ResearchDocumentPermission.document_id == doc.id
-                ).all()
-            ]
+            if selected_ids is None:
+                selected_ids = list(db.scalars(
+                    select(ResearchDocumentPermission.user_id).where(
+                        ResearchDocumentPermission.document_id == doc.id
+                    )
+                ))
             push_notifications(
                 db,
                 user_ids=selected_ids,
@@ -658,11 +824,11 @@ def delete_document(
     db: Session = Depends(get_db),
     admin: User = Depends(get_current_admin)
 ):
-    doc = db.query(ResearchDocument).filter(ResearchDocument.id == document_id).first()
-    if not doc:
+    row = db.execute(select(ResearchDocument.file_id).where(ResearchDocument.id == document_id)).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    file_id = doc.file_id
+    file_id = row.file_id
 
     db.query(ResearchDocumentPermission).filter(
         ResearchDocumentPermission.document_id == document_id
@@ -729,5 +895,6 @@ def delete_file(
 
     db.query(ResearchFile).filter(ResearchFile.id == file_id).delete(synchronize_session=False)
     db.commit()
+    _invalidate_column_permissions(file_id)
 
     return {"message": "File deleted", "file_id": file_id}
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, case, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload
+from sqlalchemy import DateTime, and_, bindparam, desc, case, func, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from collections import defaultdict
+import zlib
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 
 from app.database.session import get_db
 from app.models.task import Task
-from app.models.project import Project
+from app.models.project import Project, project_team_members
 from app.schemas.task import (
-    TaskCreate, TaskOut, TaskUpdate, 
+    TaskCreate, TaskOut, TaskOutList, TaskUpdate,
     TaskHistoryResponse, TaskTimeLogOut
 )
 from app.models.task_time_log import TaskTimeLog
@@ -18,13 +22,20 @@ from app.models.attendance import Attendance
 from app.services.attendance_service import auto_close_open_attendances_for_user, is_break_time_ist
 from app.services.tracker_service import (
     apply_overtime_status_if_needed,
-    set_task_completed,
+    cache_active_task,
+    get_cached_active_task,
+    invalidate_active_task,
     set_task_in_progress,
     set_task_paused,
 )
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+def _timer_task_columns():
+    # Only what the timer routes and the tracker status helpers read or write;
+    # description and the other wide columns stay in the database.
+    return load_only(Task.id, Task.title, Task.status, Task.estimated_hours, Task.is_overtime)
+
 
 # =====================================
 # CREATE TASK (Only Project Owner)
@@ -35,7 +46,7 @@ def create_task(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    project = db.query(Project).filter(Project.id == payload.project_id).first()
+    project = db.query(Project.owner_id).filter(Project.id == payload.project_id).first()
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -47,8 +58,14 @@ def create_task(
             detail="Only project owner can create tasks"
         )
 
-    team_ids = [u.id for u in project.team_members]
-    if payload.assigned_to not in team_ids:
+    # Membership probe instead of loading the whole team.
+    is_member = db.query(
+        select(project_team_members.c.user_id).where(
+            project_team_members.c.project_id == payload.project_id,
+            project_team_members.c.user_id == payload.assigned_to
+        ).exists()
+    ).scalar()
+    if not is_member:
         raise HTTPException(
             status_code=400,
             detail="User is not a team member of this project"
@@ -76,7 +93,7 @@ def create_task(
 # =====================================
 # GET TASKS (Limited to 15 active tasks)
 # =====================================
-@router.get("/", response_model=List[TaskOut])
+@router.get("/", response_model=List[TaskOut], response_class=ORJSONResponse)
 def get_my_tasks(
     limit: int = Query(15, ge=1, le=50),
     include_completed: bool = Query(False),
@@ -84,7 +101,13 @@ def get_my_tasks(
     current_user: User = Depends(get_current_user)
 ):
     """Get tasks for current user - limited to 15 active tasks by default"""
-    query = db.query(Task).filter(Task.assigned_to == current_user.id)
+    # project/created_user feed TaskOut's *_name fields; the assignee is
+    # current_user and already in the identity map.
+    query = db.query(Task).options(
+        joinedload(Task.project),
+        joinedload(Task.created_user),
+        raiseload("*", sql_only=True),
+    ).filter(Task.assigned_to == current_user.id)
     
     if not include_completed:
         # Exclude completed tasks from main view
@@ -106,16 +129,15 @@ def get_my_tasks(
         return []
 
     task_ids = [t.id for t in tasks]
-    now = datetime.now(timezone.utc)
+    # A single named, typed parameter: the statement text is identical on
+    # every call, so the compiled form is reused and "now" is bound once.
+    now = bindparam("now", datetime.now(timezone.utc), type_=DateTime(timezone=True))
 
     totals = db.query(
         TaskTimeLog.task_id,
         func.coalesce(
             func.sum(
-                case(
-                    (TaskTimeLog.end_time.is_(None), func.extract("epoch", now - TaskTimeLog.start_time)),
-                    else_=func.extract("epoch", TaskTimeLog.end_time - TaskTimeLog.start_time)
-                )
+                func.extract("epoch", func.coalesce(TaskTimeLog.end_time, now) - TaskTimeLog.start_time)
             ),
             0
         ).label("total_seconds")
@@ -126,13 +148,30 @@ def get_my_tasks(
 
     totals_map = {task_id: int(total_seconds or 0) for task_id, total_seconds in totals}
 
-    result = []
-    for task in tasks:
-        payload = TaskOut.model_validate(task).model_dump()
-        payload["total_time_spent"] = round((totals_map.get(task.id, 0) / 3600), 2)
-        result.append(payload)
-
-    return result
+    # Plain dicts through the shared list adapter: one core-schema call for the
+    # page, encoded by orjson, instead of per-item response_model handling.
+    return ORJSONResponse(TaskOutList.dump_python(TaskOutList.validate_python([
+        {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "project_id": task.project_id,
+            "project_name": task.project_name,
+            "assigned_to": task.assigned_to,
+            "assignee_name": task.assignee_name,
+            "assignee_profile_image": task.assignee_profile_image,
+            "created_by": task.created_by,
+            "created_by_name": task.created_by_name,
+            "created_by_profile_image": task.created_by_profile_image,
+            "priority": task.priority,
+            "status": task.status,
+            "is_overtime": task.is_overtime,
+            "due_date": task.due_date,
+            "estimated_hours": task.estimated_hours,
+            "total_time_spent": round((totals_map.get(task.id, 0) / 3600), 2),
+        }
+        for task in tasks
+    ])))
 
 
 # =====================================
@@ -147,25 +186,28 @@ def get_task_history(
     """Get completed tasks with their time logs"""
     
     # Get completed tasks for this user
-    completed_tasks = db.query(Task).filter(
+    completed_tasks = db.query(Task).options(joinedload(Task.completed_user)).filter(
         Task.assigned_to == current_user.id,
         Task.status == "completed"
     ).order_by(desc(Task.completed_at)).limit(limit).all()
-    
+
+    # Time logs for every listed task in one query, bucketed by task.
+    logs_by_task = defaultdict(list)
+    if completed_tasks:
+        for log in db.query(TaskTimeLog).filter(
+            TaskTimeLog.task_id.in_([task.id for task in completed_tasks]),
+            TaskTimeLog.user_id == current_user.id
+        ).order_by(TaskTimeLog.task_id, desc(TaskTimeLog.start_time)):
+            logs_by_task[log.task_id].append(log)
+
     result = []
     
     for task in completed_tasks:
-        # Get all time logs for this task
-        logs = db.query(TaskTimeLog).filter(
-            TaskTimeLog.task_id == task.id,
-            TaskTimeLog.user_id == current_user.id
-        ).order_by(desc(TaskTimeLog.start_time)).all()
-        
         # Calculate total time
         total_seconds = 0
         log_list = []
         
-        for log in logs:
+        for log in logs_by_task.get(task.id, ()):
             log_out = TaskTimeLogOut.model_validate(log)
             if log.end_time:
                 duration = (log.end_time - log.start_time).total_seconds()
@@ -209,6 +251,7 @@ def update_task(
 
     db.commit()
     db.refresh(task)
+    invalidate_active_task(task.assigned_to)
     return task
 
 
@@ -232,20 +275,22 @@ def start_task(
 
     # Check if user is clocked in today
     today = now.date()
-    attendance = db.query(Attendance).filter(
-        Attendance.user_id == current_user.id,
-        Attendance.date == today,
-        Attendance.clock_in_time != None
-    ).first()
-
-    if not attendance:
+    is_clocked_in = db.execute(
+        select(literal(1)).where(
+            Attendance.user_id == current_user.id,
+            Attendance.date == today,
+            Attendance.clock_in_time != None
+        ).limit(1)
+    ).scalar() is not None
+
+    if not is_clocked_in:
         raise HTTPException(
             status_code=400,
             detail="You must be clocked in to start a task"
         )
 
     # Get task and verify assignment
-    task = db.query(Task).filter(
+    task = db.query(Task).options(_timer_task_columns()).filter(
         Task.id == task_id,
         Task.assigned_to == current_user.id
     ).first()
@@ -274,7 +319,7 @@ def start_task(
                 "duration_seconds": current_duration
             }
         running.end_time = now
-        previous_task = db.query(Task).filter(
+        previous_task = db.query(Task).options(_timer_task_columns()).filter(
             Task.id == running.task_id,
             Task.assigned_to == current_user.id
         ).first()
@@ -294,7 +339,14 @@ def start_task(
     apply_overtime_status_if_needed(task, db)
 
     db.add(log)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent start for the same user lost the race on the
+        # one-running-timer index.
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Another task timer was just started")
+    invalidate_active_task(current_user.id)
 
     return {
         "message": "Task started successfully",
@@ -326,7 +378,7 @@ def stop_task(
     # Stop the timer
     log.end_time = datetime.now(timezone.utc)
 
-    task = db.query(Task).filter(
+    task = db.query(Task).options(_timer_task_columns()).filter(
         Task.id == task_id,
         Task.assigned_to == current_user.id
     ).first()
@@ -336,6 +388,7 @@ def stop_task(
 
     duration = (log.end_time - log.start_time).total_seconds()
     db.commit()
+    invalidate_active_task(current_user.id)
 
     return {
         "message": "Task stopped successfully",
@@ -348,46 +401,91 @@ def stop_task(
 # =====================================
 # COMPLETE TASK
 # =====================================
+# Both statements are built once at import; a request only binds tid, uid and
+# now, so there is no per-call expression construction and the compiled form
+# is always a cache hit.
+_complete_now = bindparam("now", type_=DateTime(timezone=True))
+
+# Logged time across all of the task's logs; a still-open log counts up to now.
+_complete_logged_seconds = select(
+    func.coalesce(
+        func.sum(
+            case(
+                (
+                    func.coalesce(TaskTimeLog.end_time, _complete_now) > TaskTimeLog.start_time,
+                    func.extract("epoch", func.coalesce(TaskTimeLog.end_time, _complete_now) - TaskTimeLog.start_time)
+                ),
+                else_=0
+            )
+        ),
+        0
+    )
+).where(TaskTimeLog.task_id == Task.id).scalar_subquery()
+
+# Mark completed and settle the overtime flag in one UPDATE ... RETURNING;
+# the ownership and "already completed" checks ride along in the WHERE.
+_COMPLETE_TASK_STMT = update(Task).where(
+    Task.id == bindparam("tid"),
+    Task.assigned_to == bindparam("uid"),
+    Task.status != "completed"
+).values(
+    status="completed",
+    completed_at=_complete_now,
+    completed_by=bindparam("uid"),
+    is_overtime=case(
+        (Task.estimated_hours > 0, _complete_logged_seconds > Task.estimated_hours * 3600),
+        else_=False
+    )
+).returning(Task.title, Task.completed_at)
+
+_CLOSE_TASK_LOG_STMT = update(TaskTimeLog).where(
+    TaskTimeLog.task_id == bindparam("tid"),
+    TaskTimeLog.user_id == bindparam("uid"),
+    TaskTimeLog.end_time == None
+).values(end_time=_complete_now)
+
+
 @router.post("/{task_id}/complete")
 def complete_task(
     task_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # Get task
-    task = db.query(Task).filter(
-        Task.id == task_id,
-        Task.assigned_to == current_user.id
+    # One instant for the whole completion: completed_at, the overtime check
+    # and the log close all see the same "now".
+    params = {"tid": task_id, "uid": current_user.id, "now": datetime.now(timezone.utc)}
+    completed = db.execute(
+        _COMPLETE_TASK_STMT,
+        params,
+        execution_options={"synchronize_session": False}
     ).first()
 
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    if task.status == "completed":
+    if completed is None:
+        exists = db.execute(
+            select(literal(1)).where(
+                Task.id == task_id,
+                Task.assigned_to == current_user.id
+            ).limit(1)
+        ).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Task not found")
         raise HTTPException(status_code=400, detail="Task is already completed")
 
     # Stop any running timer for this task
-    running_log = db.query(TaskTimeLog).filter(
-        TaskTimeLog.task_id == task_id,
-        TaskTimeLog.user_id == current_user.id,
-        TaskTimeLog.end_time == None
-    ).first()
-
-    if running_log:
-        running_log.end_time = datetime.now(timezone.utc)
-
-    # Mark as completed and then check if logged time exceeded estimate.
-    set_task_completed(task, current_user.id, db)
-    apply_overtime_status_if_needed(task, db)
+    db.execute(
+        _CLOSE_TASK_LOG_STMT,
+        params,
+        execution_options={"synchronize_session": False}
+    )
 
     db.commit()
-    db.refresh(task)
+    invalidate_active_task(current_user.id)
 
     return {
         "message": "Task marked as completed",
         "task_id": task_id,
-        "task_title": task.title,
-        "completed_at": task.completed_at
+        "task_title": completed.title,
+        "completed_at": completed.completed_at
     }
 
 
@@ -411,53 +509,105 @@ def delete_task(
             detail="Only project owner can delete tasks"
         )
 
+    assignee_id = task.assigned_to
     db.delete(task)
     db.commit()
+    invalidate_active_task(assignee_id)
     return {"message": "Task deleted successfully"}
 
 
 # =====================================
 # GET ACTIVE TASK
 # =====================================
+def _active_task_etag(
+    task_id: Optional[int],
+    start_time: Optional[datetime],
+    title: Optional[str] = None,
+    task_status: Optional[str] = None,
+) -> str:
+    # Weak: total_seconds keeps growing, but while the same log stays open the
+    # client can derive it from completed_seconds + (now - start_time). Title
+    # and status can be edited while the timer runs, so they are part of the tag.
+    if task_id is None:
+        return 'W/"none"'
+    fields_hash = zlib.crc32(f"{title}\x00{task_status}".encode())
+    return f'W/"{task_id}-{int(start_time.timestamp())}-{fields_hash:08x}"'
+
+
 @router.get("/active")
 def get_active_task(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    log = db.query(TaskTimeLog).filter(
-        TaskTimeLog.user_id == current_user.id,
-        TaskTimeLog.end_time == None
-    ).first()
-
-    if not log:
-        return None
-
-    task = db.query(Task).filter(Task.id == log.task_id).first()
-    if not task:
-        return None
-
-    now = datetime.now(timezone.utc)
-    completed_seconds = db.query(
-        func.coalesce(
-            func.sum(
-                func.extract("epoch", TaskTimeLog.end_time - TaskTimeLog.start_time)
-            ),
-            0
+    if_none_match = request.headers.get("if-none-match")
+    cached, payload = get_cached_active_task(current_user.id)
+    if cached:
+        etag = _active_task_etag(
+            payload and payload["id"],
+            payload and payload["start_time"],
+            payload and payload["title"],
+            payload and payload["status"],
         )
-    ).filter(
-        TaskTimeLog.user_id == current_user.id,
-        TaskTimeLog.task_id == log.task_id,
-        TaskTimeLog.end_time != None
-    ).scalar() or 0
-
-    running_seconds = int((now - log.start_time).total_seconds())
-
-    return {
-        "id": task.id,
-        "title": task.title,
-        "start_time": log.start_time,
-        "status": task.status,
-        "total_seconds": int(completed_seconds) + running_seconds
-    }
-
-
+    else:
+        # The open-log probe is an index lookup plus a primary-key join; the
+        # aggregate only runs when the client's copy is out of date.
+        open_log = db.execute(
+            select(TaskTimeLog.task_id, TaskTimeLog.start_time, Task.title, Task.status)
+            .join(Task, Task.id == TaskTimeLog.task_id)
+            .where(
+                TaskTimeLog.user_id == current_user.id,
+                TaskTimeLog.end_time == None
+            ).limit(1)
+        ).first()
+        etag = _active_task_etag(
+            open_log and open_log.task_id,
+            open_log and open_log.start_time,
+            open_log and open_log.title,
+            open_log and open_log.status,
+        )
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+        payload = None
+        if open_log:
+            now_utc = datetime.now(timezone.utc)
+            now = bindparam("now", now_utc, type_=DateTime(timezone=True))
+            # The running log counts up to "now", so one aggregate covers closed and open time.
+            total_seconds = select(
+                func.coalesce(
+                    func.sum(
+                        func.extract("epoch", func.coalesce(TaskTimeLog.end_time, now) - TaskTimeLog.start_time)
+                    ),
+                    0
+                )
+            ).where(
+                TaskTimeLog.user_id == current_user.id,
+                TaskTimeLog.task_id == Task.id
+            ).scalar_subquery()
+
+            active = db.execute(
+                select(Task.id, Task.title, Task.status, total_seconds.label("total_seconds")).where(
+                    Task.id == open_log.task_id
+                )
+            ).first()
+            if active:
+                total = int(active.total_seconds or 0)
+                running = int((now_utc - open_log.start_time).total_seconds())
+                payload = {
+                    "id": active.id,
+                    "title": active.title,
+                    "start_time": open_log.start_time,
+                    "status": active.status,
+                    "total_seconds": total,
+                    "completed_seconds": max(total - running, 0)
+                }
+
+        cache_active_task(current_user.id, payload)
+
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return payload
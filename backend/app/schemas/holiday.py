@@ -5,6 +5,8 @@ from app.models.holiday import HolidayType
 
 
 class HolidayCreate(BaseModel):
+    model_config = {"frozen": True}
+
     name: str
     date: date
     type: HolidayType = HolidayType.full_day
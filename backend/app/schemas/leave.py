@@ -1,11 +1,16 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, TypeAdapter, field_validator, model_validator
 from datetime import date, datetime, time
 from typing import Optional, Literal
 from app.schemas.user import UserOut
+from app.core.request_context import request_today
 
 
+SAME_DAY_DURATION_TYPES = frozenset({"full_day", "first_half", "second_half"})
+
 # -------- CREATE --------
 class LeaveCreate(BaseModel):
+    model_config = {"frozen": True}
+
     leave_type: Literal["casual", "sick", "annual", "unpaid"]
     duration_type: Literal["full_day", "first_half", "second_half", "duration"]
     start_date: date
@@ -25,12 +30,12 @@ class LeaveCreate(BaseModel):
 
     @model_validator(mode="after")
     def validate_dates_and_duration(self):
-        today = date.today()
+        today = request_today()
         if self.start_date < today or self.end_date < today:
             raise ValueError("Only today or upcoming dates are allowed")
         if self.start_date > self.end_date:
             raise ValueError("Start date cannot be after end date")
-        if self.duration_type in {"full_day", "first_half", "second_half"} and self.start_date != self.end_date:
+        if self.duration_type in SAME_DAY_DURATION_TYPES and self.start_date != self.end_date:
             raise ValueError("For full day or half day leave, start and end date must be the same")
         if self.leave_hours is not None:
             if self.leave_hours <= 0:
@@ -69,3 +74,8 @@ class LeaveOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Built once at import: list endpoints validate and dump a whole page of
+# leaves in one core-schema call instead of per item.
+LeaveOutList = TypeAdapter(list[LeaveOut])
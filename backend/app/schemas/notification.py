@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 
 class NotificationOut(BaseModel):
@@ -18,3 +18,6 @@ class NotificationOut(BaseModel):
     class Config:
         from_attributes = True
 
+
+# Built once at import so the feed validates and dumps a page in one call.
+NotificationOutList = TypeAdapter(list[NotificationOut])
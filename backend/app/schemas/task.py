@@ -1,8 +1,9 @@
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, TypeAdapter, field_validator, model_validator
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Optional, List, Literal
 from enum import Enum
 from app.schemas.user import UserOut
+from app.core.request_context import request_today
 
 class TaskStatusEnum(str, Enum):
     PENDING = "pending"
@@ -16,14 +17,21 @@ class TaskPriorityEnum(str, Enum):
     HIGH = "high"
 
 
+# Accepted input values; "overdue" is a status the tracker itself assigns.
+TaskStatusValue = Literal["pending", "in_progress", "completed", "overdue"]
+TaskPriorityValue = Literal["low", "medium", "high"]
+
+
 # ---------- CREATE ----------
 class TaskCreate(BaseModel):
+    model_config = {"frozen": True}
+
     title: str
     description: Optional[str] = None
     due_date: Optional[date] = None
     assigned_to: int
     project_id: int
-    priority: Optional[str] = "medium"
+    priority: Optional[TaskPriorityValue] = "medium"
     estimated_hours: Optional[float] = None
 
     @field_validator("title")
@@ -55,7 +63,7 @@ class TaskCreate(BaseModel):
     def validate_due_date(cls, value: Optional[date]):
         if value is None:
             return value
-        if value < date.today():
+        if value < request_today():
             raise ValueError("Due date must be today or an upcoming date")
         return value
 
@@ -64,10 +72,10 @@ class TaskCreate(BaseModel):
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
-    status: Optional[str] = None
+    status: Optional[TaskStatusValue] = None
     due_date: Optional[date] = None
     assigned_to: Optional[int] = None
-    priority: Optional[str] = None
+    priority: Optional[TaskPriorityValue] = None
     estimated_hours: Optional[float] = None
 
     @field_validator("title")
@@ -85,7 +93,7 @@ class TaskUpdate(BaseModel):
     def validate_due_date(cls, value: Optional[date]):
         if value is None:
             return value
-        if value < date.today():
+        if value < request_today():
             raise ValueError("Due date must be today or an upcoming date")
         return value
 
@@ -138,3 +146,6 @@ class TaskOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+TaskOutList = TypeAdapter(list[TaskOut])
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr, field_validator, model_validator, field_serializer
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter, field_validator, model_validator, field_serializer
 from datetime import datetime, time
-from typing import Optional
+from typing import Annotated, Optional
 from datetime import date
 import re
 
@@ -99,9 +99,12 @@ class EmployeeOut(BaseModel):
     is_active: bool = True
     created_at: Optional[datetime] = None
 
-    model_config = {
-    "from_attributes": True
-}
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm_trusted(cls, user) -> "EmployeeOut":
+        """Build from a loaded User row without re-running field validation."""
+        return cls.model_construct(**{name: getattr(user, name) for name in cls.model_fields})
 
     @field_serializer("shift_start_time", "shift_end_time")
     def serialize_shift_time(self, value: Optional[str | time]):
@@ -111,6 +114,9 @@ class EmployeeOut(BaseModel):
 
 
 
+EmployeeOutList = TypeAdapter(list[EmployeeOut])
+
+
 class UserOut(BaseModel):
     id: int
     name: str
@@ -122,8 +128,7 @@ class UserOut(BaseModel):
     is_active: bool = True
     created_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, validate_assignment=False)
 
 class ChangePasswordRequest(BaseModel):
     new_password: str
@@ -134,15 +139,28 @@ class AdminCreate(BaseModel):
     password: str
 
 INDIA_PHONE_REGEX = re.compile(r"^\+91\d{10}$")
-INTERNATIONAL_PHONE_REGEX = re.compile(r"^\+[1-9]\d{7,14}$")
-BANK_NAME_REGEX = re.compile(r"^[A-Za-z][A-Za-z .,&'-]{1,99}$")
-ACCOUNT_NUMBER_REGEX = re.compile(r"^\d{9,18}$")
+PHONE_PATTERN = r"^\+[1-9]\d{7,14}$"
+BANK_NAME_PATTERN = r"^[A-Za-z][A-Za-z .,&'-]{1,99}$"
+ACCOUNT_NUMBER_PATTERN = r"^\d{9,18}$"
+
+# Matched inside pydantic-core instead of a Python validator per field.
+PhoneStr = Annotated[str, Field(pattern=PHONE_PATTERN)]
+BankNameStr = Annotated[str, Field(pattern=BANK_NAME_PATTERN)]
+AccountNumberStr = Annotated[str, Field(pattern=ACCOUNT_NUMBER_PATTERN)]
+
+# pydantic-core reports a mismatch with the raw pattern; these are the
+# messages the profile forms show instead.
+PATTERN_ERROR_MESSAGES = {
+    PHONE_PATTERN: "Phone must be in international format like +919876543210",
+    BANK_NAME_PATTERN: "Bank name is invalid",
+    ACCOUNT_NUMBER_PATTERN: "Account number must be 9 to 18 digits",
+}
 
 
 class AdminProfileUpdateSchema(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
-    phone: Optional[str] = None
+    phone: Optional[PhoneStr] = None
     department: Optional[str] = None
     designation: Optional[str] = None
 
@@ -154,29 +172,20 @@ class AdminProfileUpdateSchema(BaseModel):
             return value or None
         return value
 
-    @field_validator("phone")
-    @classmethod
-    def validate_phone(cls, value: Optional[str]):
-        if value is None:
-            return value
-        if not INTERNATIONAL_PHONE_REGEX.fullmatch(value):
-            raise ValueError("Phone must be in international format like +919876543210")
-        return value
-
 
 # ---------------- PROFILE UPDATE ----------------
 
 class ProfileUpdateSchema(BaseModel):
-    phone: Optional[str] = None
+    phone: Optional[PhoneStr] = None
     address: Optional[str] = None
     date_of_birth: Optional[date] = None
     gender: Optional[str] = None
     marital_status: Optional[str] = None
     blood_group: Optional[str] = None
     emergency_contact_name: Optional[str] = None
-    emergency_contact_phone: Optional[str] = None
-    bank_name: Optional[str] = None
-    account_number: Optional[str] = None
+    emergency_contact_phone: Optional[PhoneStr] = None
+    bank_name: Optional[BankNameStr] = None
+    account_number: Optional[AccountNumberStr] = None
     ifsc_code: Optional[str] = None
     profile_image: Optional[str] = None
     current_password: Optional[str] = None
@@ -190,33 +199,6 @@ class ProfileUpdateSchema(BaseModel):
             return value or None
         return value
 
-    @field_validator("phone", "emergency_contact_phone")
-    @classmethod
-    def validate_indian_phone(cls, value: Optional[str]):
-        if value is None:
-            return value
-        if not INTERNATIONAL_PHONE_REGEX.fullmatch(value):
-            raise ValueError("Phone must be in international format like +919876543210")
-        return value
-
-    @field_validator("bank_name")
-    @classmethod
-    def validate_bank_name(cls, value: Optional[str]):
-        if value is None:
-            return value
-        if not BANK_NAME_REGEX.fullmatch(value):
-            raise ValueError("Bank name is invalid")
-        return value
-
-    @field_validator("account_number")
-    @classmethod
-    def validate_account_number(cls, value: Optional[str]):
-        if value is None:
-            return value
-        if not ACCOUNT_NUMBER_REGEX.fullmatch(value):
-            raise ValueError("Account number must be 9 to 18 digits")
-        return value
-
     @model_validator(mode="after")
     def validate_bank_fields_together(self):
         bank_name = self.bank_name
@@ -252,6 +234,4 @@ class ProfileResponse(BaseModel):
     is_active: bool = True
     created_at: Optional[datetime] = None
 
-    model_config = {
-        "from_attributes": True
-    }
+    model_config = ConfigDict(from_attributes=True)
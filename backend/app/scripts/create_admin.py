@@ -5,8 +5,8 @@ from app.core.security import hash_password
 def create_admin():
     db = SessionLocal()
 
-    existing_admin = db.query(User).filter(User.role == "admin").first()
-    if existing_admin:
+    admin_exists = db.query(User.id).filter(User.role == "admin").first() is not None
+    if admin_exists:
         print("Admin already exists")
         return
 
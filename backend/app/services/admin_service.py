@@ -1,17 +1,16 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.database.session import commit_without_expire
 from app.models.user import User
 from app.core.security import hash_password
+from app.schemas.user import EmployeeCreate
 from app.utils.generator import generate_employee_id, generate_temp_password
 
-def create_employee(
-    db: Session,
-    name: str,
-    email: str,
-    department: str | None,
-    designation: str | None
-):
-    if db.query(User).filter(User.email == email).first():
+def create_employee(db: Session, payload: EmployeeCreate):
+    # The generated ID replaces the one on the payload.
+    data = payload.model_dump(exclude={"employee_id"})
+    email = data["email"]
+    if db.query(db.query(User).filter(User.email == email).exists()).scalar():
         raise HTTPException(status_code=400, detail="Email already exists")
 
     count = db.query(User).count()
@@ -19,19 +18,15 @@ def create_employee(
     temp_password = generate_temp_password()
 
     user = User(
-        name=name,
-        email=email,
+        **data,
         employee_id=employee_id,
         password_hash=hash_password(temp_password),
         role="employee",
-        department=department,
-        designation=designation,
         is_active=True,
         force_password_change=True
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    commit_without_expire(db)
 
     return user, temp_password
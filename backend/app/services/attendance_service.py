@@ -1,11 +1,13 @@
 import os
 from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 
 from fastapi import HTTPException
 from sqlalchemy import inspect, text
 from sqlalchemy.exc import IntegrityError
 
 from app.core.attendance_ws_manager import attendance_ws_manager
+from app.database.session import commit_without_expire
 from app.models.attendance import Attendance
 from app.models.holiday import Holiday
 from app.models.leave import Leave
@@ -44,6 +46,19 @@ SECOND_HALF_START = time(14, 0)
 FIRST_HALF_END = time(13, 0)
 SECOND_HALF_LATE_THRESHOLD = _parse_time_env("ATTENDANCE_SECOND_HALF_LATE_THRESHOLD", time(14, 30))
 
+# IST is a fixed +05:30 with no DST, so the IST helpers below work in integer
+# offsets from the Unix epoch instead of converting through tzinfo.
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORDINAL = _EPOCH_UTC.toordinal()
+_ONE_SECOND = timedelta(seconds=1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_DAY_SECONDS = 86_400
+_DAY_US = _DAY_SECONDS * 1_000_000
+_IST_OFFSET_US = IST_OFFSET_SECONDS * 1_000_000
+_BREAK_START_US = BREAK_START_HOUR * 3600 * 1_000_000
+_BREAK_END_US = BREAK_END_HOUR * 3600 * 1_000_000
+
 
 def _late_threshold_for_shift(shift: str | None) -> time:
     normalized = (shift or "full_day").strip().lower()
@@ -105,30 +120,53 @@ def notify_attendance_state_change(user_id: int) -> None:
 
 
 def _ensure_aware_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is timezone.utc:
+        return dt
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
 
+def _ist_midnight_utc(day: date) -> datetime:
+    return _EPOCH_UTC + timedelta(seconds=(day.toordinal() - _EPOCH_ORDINAL) * _DAY_SECONDS - IST_OFFSET_SECONDS)
+
+
+def _ist_epoch_seconds(now: datetime | None) -> int:
+    """Whole seconds since the epoch, shifted so that day boundaries fall on IST midnight."""
+    current = _ensure_aware_utc(now or datetime.now(timezone.utc))
+    return (current - _EPOCH_UTC) // _ONE_SECOND + IST_OFFSET_SECONDS
+
+
+# The per-day helpers below are pure functions of the date and module
+# constants, and datetimes are immutable, so each day is built once per process.
+@lru_cache(maxsize=1024)
 def _break_window_utc_for_ist_date(day: date) -> tuple[datetime, datetime]:
-    break_start_ist = datetime.combine(day, time(hour=BREAK_START_HOUR, minute=0), tzinfo=IST)
-    break_end_ist = datetime.combine(day, time(hour=BREAK_END_HOUR, minute=0), tzinfo=IST)
-    return break_start_ist.astimezone(timezone.utc), break_end_ist.astimezone(timezone.utc)
+    midnight = _ist_midnight_utc(day)
+    return (
+        midnight + timedelta(hours=BREAK_START_HOUR),
+        midnight + timedelta(hours=BREAK_END_HOUR),
+    )
 
 
+@lru_cache(maxsize=1024)
 def _shift_end_utc_for_ist_date(day: date) -> datetime:
-    shift_end_ist = datetime.combine(day, SHIFT_END, tzinfo=IST)
-    return shift_end_ist.astimezone(timezone.utc)
+    return _ist_midnight_utc(day) + timedelta(hours=SHIFT_END.hour, minutes=SHIFT_END.minute)
+
+
+@lru_cache(maxsize=1024)
+def ist_day_bounds_utc(day: date) -> tuple[datetime, datetime]:
+    """First and last instant of an IST calendar day, in UTC."""
+    midnight = _ist_midnight_utc(day)
+    return midnight, midnight + timedelta(days=1) - _ONE_MICROSECOND
 
 
 def is_break_time_ist(now: datetime | None = None) -> bool:
-    current = _ensure_aware_utc(now or datetime.now(timezone.utc)).astimezone(IST)
-    return BREAK_START_HOUR <= current.hour < BREAK_END_HOUR
+    seconds_of_day = _ist_epoch_seconds(now) % _DAY_SECONDS
+    return BREAK_START_HOUR * 3600 <= seconds_of_day < BREAK_END_HOUR * 3600
 
 
 def get_ist_date(now: datetime | None = None) -> date:
-    current = _ensure_aware_utc(now or datetime.now(timezone.utc))
-    return current.astimezone(IST).date()
+    return date.fromordinal(_EPOCH_ORDINAL + _ist_epoch_seconds(now) // _DAY_SECONDS)
 
 
 def _is_holiday_for_user(db, user, target_date: date) -> bool:
@@ -242,19 +280,27 @@ def calculate_work_seconds(clock_in: datetime, clock_out: datetime) -> int:
     if clock_out <= clock_in:
         return 0
 
-    total_seconds = int((clock_out - clock_in).total_seconds())
+    # IST has no DST, so each IST day's break window is a fixed offset from its
+    # midnight; everything below is integer microseconds since the epoch.
+    start_us = (clock_in - _EPOCH_UTC) // _ONE_MICROSECOND
+    end_us = (clock_out - _EPOCH_UTC) // _ONE_MICROSECOND
+    total_seconds = (end_us - start_us) // 1_000_000
     break_overlap = 0
 
-    current_day = clock_in.astimezone(IST).date()
-    last_day = clock_out.astimezone(IST).date()
-
-    while current_day <= last_day:
-        break_start, break_end = _break_window_utc_for_ist_date(current_day)
-        overlap_start = max(clock_in, break_start)
-        overlap_end = min(clock_out, break_end)
-        if overlap_end > overlap_start:
-            break_overlap += int((overlap_end - overlap_start).total_seconds())
-        current_day += timedelta(days=1)
+    first_day = (start_us + _IST_OFFSET_US) // _DAY_US
+    last_day = (end_us + _IST_OFFSET_US) // _DAY_US
+    if first_day == last_day:
+        # Most sessions sit within one IST day entirely before or after the break.
+        day_start = first_day * _DAY_US - _IST_OFFSET_US
+        if end_us <= day_start + _BREAK_START_US or start_us >= day_start + _BREAK_END_US:
+            return total_seconds
+
+    for day in range(first_day, last_day + 1):
+        break_start = day * _DAY_US - _IST_OFFSET_US + _BREAK_START_US
+        break_end = day * _DAY_US - _IST_OFFSET_US + _BREAK_END_US
+        overlap = min(end_us, break_end) - max(start_us, break_start)
+        if overlap > 0:
+            break_overlap += overlap // 1_000_000
 
     return max(total_seconds - break_overlap, 0)
 
@@ -427,28 +473,23 @@ def get_attendance_status_meta(attendance: Attendance | None, now: datetime | No
     }
 
 
-def _close_running_tasks(user_id: int, close_at: datetime, db) -> None:
-    running_tasks = db.query(TaskTimeLog).filter(
+def _close_running_tasks(user_id: int, close_at: datetime, db) -> int:
+    # One UPDATE for all of the user's running logs; nothing is loaded.
+    return db.query(TaskTimeLog).filter(
         TaskTimeLog.user_id == user_id,
         TaskTimeLog.end_time == None
-    ).all()
-    for log in running_tasks:
-        log.end_time = close_at
+    ).update({TaskTimeLog.end_time: close_at}, synchronize_session=False)
 
 
 def close_running_tasks_for_user(user_id: int, close_at: datetime, db) -> int:
-    running_tasks = db.query(TaskTimeLog).filter(
-        TaskTimeLog.user_id == user_id,
-        TaskTimeLog.end_time == None
-    ).all()
-    for log in running_tasks:
-        log.end_time = close_at
-    if running_tasks:
+    closed = _close_running_tasks(user_id, close_at, db)
+    if closed:
         db.commit()
-    return len(running_tasks)
+        attendance_ws_manager.notify_task_change_threadsafe(user_id)
+    return closed
 
 
-def _sync_status_fields(attendance: Attendance, now: datetime | None = None) -> None:
+def _sync_status_fields(attendance: Attendance, now: datetime) -> None:
     seconds = get_attendance_worked_seconds(attendance, now)
     status = determine_attendance_status(attendance, seconds, now)
     meta = get_attendance_status_meta(attendance, now)
@@ -460,9 +501,9 @@ def _sync_status_fields(attendance: Attendance, now: datetime | None = None) ->
         attendance.overtime_hours = round(float(meta["overtime_seconds"] or 0) / 3600, 2)
 
 
-def _close_attendance(attendance: Attendance, close_at: datetime, db) -> None:
+def _close_attendance(attendance: Attendance, close_at: datetime, db, close_tasks: bool = True) -> int:
     if not attendance.clock_in_time:
-        return
+        return 0
 
     effective_close = max(close_at, attendance.clock_in_time)
     attendance.total_seconds = (attendance.total_seconds or 0) + calculate_work_seconds(
@@ -471,8 +512,9 @@ def _close_attendance(attendance: Attendance, close_at: datetime, db) -> None:
     )
     attendance.clock_out_time = effective_close
     attendance.clock_in_time = None
-    _close_running_tasks(attendance.user_id, effective_close, db)
+    closed_tasks = _close_running_tasks(attendance.user_id, effective_close, db) if close_tasks else 0
     _sync_status_fields(attendance, now=effective_close)
+    return closed_tasks
 
 
 def close_open_attendances_for_user(user_id: int, close_at: datetime, db) -> int:
@@ -482,26 +524,26 @@ def close_open_attendances_for_user(user_id: int, close_at: datetime, db) -> int
         Attendance.clock_out_time == None
     ).all()
 
-    closed = 0
-    changed_users: set[int] = set()
-    for row in open_rows:
-        _close_attendance(row, close_at, db)
-        closed += 1
-        changed_users.add(row.user_id)
-    if closed:
-        db.commit()
-        for changed_user_id in changed_users:
-            _notify_attendance_state_change(changed_user_id)
-    else:
+    if not open_rows:
         close_running_tasks_for_user(user_id, close_at, db)
-    return closed
+        return 0
+
+    # The first close stops every running log; later rows would match none.
+    closed_tasks = 0
+    for index, row in enumerate(open_rows):
+        closed_tasks += _close_attendance(row, close_at, db, close_tasks=index == 0)
+    db.commit()
+    _notify_attendance_state_change(user_id)
+    if closed_tasks:
+        attendance_ws_manager.notify_task_change_threadsafe(user_id)
+    return len(open_rows)
 
 
-def auto_close_if_needed(attendance: Attendance, db, now: datetime | None = None) -> bool:
+def _auto_close_at(attendance: Attendance, now: datetime) -> datetime | None:
+    """When an open session should have been closed, or None if it may keep running."""
     if not attendance or not attendance.clock_in_time:
-        return False
+        return None
 
-    now = _ensure_aware_utc(now or datetime.now(timezone.utc))
     now_ist_date = now.astimezone(IST).date()
     clock_in_utc = _ensure_aware_utc(attendance.clock_in_time)
     local_day = clock_in_utc.astimezone(IST).date()
@@ -509,44 +551,39 @@ def auto_close_if_needed(attendance: Attendance, db, now: datetime | None = None
     shift_end = _shift_end_utc_for_ist_date(local_day)
 
     if local_day < now_ist_date:
-        _close_attendance(attendance, shift_end, db)
-        db.commit()
-        _notify_attendance_state_change(attendance.user_id)
-        return True
-
+        return shift_end
     if clock_in_utc < break_start <= now:
-        _close_attendance(attendance, break_start, db)
-        db.commit()
-        _notify_attendance_state_change(attendance.user_id)
-        return True
-
+        return break_start
     if clock_in_utc < shift_end <= now:
-        _close_attendance(attendance, shift_end, db)
-        db.commit()
-        _notify_attendance_state_change(attendance.user_id)
-        return True
-
-    return False
+        return shift_end
+    return None
 
 
-def auto_close_open_attendances_for_user(user_id: int, db, now: datetime | None = None) -> int:
-    now = now or datetime.now(timezone.utc)
+def auto_close_open_attendances_for_user(user_id: int, db, now: datetime) -> int:
     open_rows = db.query(Attendance).filter(
         Attendance.user_id == user_id,
         Attendance.clock_in_time != None,
         Attendance.clock_out_time == None
     ).order_by(Attendance.date.asc()).all()
 
-    closed = 0
-    for row in open_rows:
-        if auto_close_if_needed(row, db, now=now):
-            closed += 1
-    return closed
+    due = [(row, close_at) for row in open_rows if (close_at := _auto_close_at(row, now)) is not None]
+    if not due:
+        return 0
+
+    # One running-log UPDATE and one commit for the whole backlog of stale
+    # sessions; the earliest close stops every running log.
+    closed_tasks = 0
+    for index, (row, close_at) in enumerate(due):
+        closed_tasks += _close_attendance(row, close_at, db, close_tasks=index == 0)
+    db.commit()
+    _notify_attendance_state_change(user_id)
+    if closed_tasks:
+        attendance_ws_manager.notify_task_change_threadsafe(user_id)
+    return len(due)
 
 
-def clock_in(current_user, db):
+def clock_in(current_user, db, now: datetime):
     ensure_attendance_schema(db)
-    now = _ensure_aware_utc(datetime.now(timezone.utc))
     now_ist = now.astimezone(IST)
     today = now_ist.date()
 
@@ -577,20 +614,30 @@ def clock_in(current_user, db):
     shift_late_threshold = _late_threshold_for_shift(getattr(current_user, "shift", None))
 
     if not attendance:
+        # Every column is set here, including the NULL ones: the commit below
+        # keeps the row loaded instead of refreshing it, and the response
+        # serializes whatever is loaded.
         attendance = Attendance(
             user_id=current_user.id,
             date=today,
             clock_in_time=now,
+            clock_out_time=None,
             first_clock_in_time=now,
             total_seconds=0,
             status="late" if now_ist.time() > shift_late_threshold else "present",
+            half_day_type=None,
             is_late=now_ist.time() > shift_late_threshold,
             overtime_hours=0,
+            working_from=None,
+            location=None,
+            manual_override=False,
+            is_manual_edit=False,
+            updated_by_admin_id=None,
+            edit_reason=None,
         )
         db.add(attendance)
         try:
-            db.commit()
-            db.refresh(attendance)
+            commit_without_expire(db)
             _notify_attendance_state_change(current_user.id)
             return attendance
         except IntegrityError:
@@ -618,28 +665,24 @@ def clock_in(current_user, db):
     attendance.updated_by_admin_id = None
     attendance.status = "late" if now_ist.time() > shift_late_threshold else "present"
     _sync_status_fields(attendance, now=now)
-    db.commit()
-    db.refresh(attendance)
+    commit_without_expire(db)
     _notify_attendance_state_change(current_user.id)
     return attendance
 
 
-def clock_out(attendance: Attendance, db):
+def clock_out(attendance: Attendance, db, now: datetime):
     if not attendance or not attendance.clock_in_time:
         raise HTTPException(status_code=400, detail="Not clocked in")
 
     ensure_attendance_schema(db)
-    now = datetime.now(timezone.utc)
     _close_attendance(attendance, now, db)
-    db.commit()
-    db.refresh(attendance)
+    commit_without_expire(db)
     _notify_attendance_state_change(attendance.user_id)
     return attendance
 
 
-def get_today_total(user_id, db):
+def get_today_total(user_id, db, now: datetime):
     ensure_attendance_schema(db)
-    now = datetime.now(timezone.utc)
     today = now.astimezone(IST).date()
 
     auto_close_open_attendances_for_user(user_id, db, now=now)
@@ -1,14 +1,19 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import extract
+from sqlalchemy import extract, insert, update
 from datetime import date, datetime, timezone
-from typing import Optional
+from typing import Iterator, Optional
 
+from app.core.ttl_cache import TTLCache
 from app.models.holiday import Holiday, HolidayType
 from app.models.attendance import Attendance
 from app.models.user import User
-from app.schemas.holiday import HolidayCreate, HolidayUpdate
+from app.schemas.holiday import HolidayCreate, HolidayUpdate, HolidayOut
 from fastapi import HTTPException
 
+# Per-date holiday payloads for the calendar's /holidays/check/{date} calls.
+# Cleared on every holiday write; the TTL bounds staleness across workers.
+_date_cache = TTLCache(ttl_seconds=60, max_entries=4096)
+
 
 # ─── HELPERS ──────────────────────────────────────────────────────────────────
 
@@ -81,13 +86,13 @@ def _auto_mark_holiday_attendance(
 
 # ─── CRUD ─────────────────────────────────────────────────────────────────────
 
-def get_all_holidays(
+def _holidays_query(
     db: Session,
     year: Optional[int] = None,
     month: Optional[int] = None,
     department: Optional[str] = None,
     holiday_type: Optional[str] = None,
-) -> list[Holiday]:
+):
     q = db.query(Holiday)
 
     if year:
@@ -103,7 +108,59 @@ def get_all_holidays(
     if holiday_type:
         q = q.filter(Holiday.type == holiday_type)
 
-    return q.order_by(Holiday.date.asc()).all()
+    return q.order_by(Holiday.date.asc())
+
+
+def get_all_holidays(
+    db: Session,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    department: Optional[str] = None,
+    holiday_type: Optional[str] = None,
+) -> list[Holiday]:
+    return _holidays_query(db, year, month, department, holiday_type).all()
+
+
+def iter_holidays(
+    db: Session,
+    year: Optional[int] = None,
+    chunk_size: int = 500,
+) -> Iterator[Holiday]:
+    """Stream holidays in chunks (server-side cursor on PostgreSQL) for exports."""
+    return iter(_holidays_query(db, year=year).yield_per(chunk_size))
+
+
+def bulk_upsert_holidays(
+    db: Session,
+    to_insert: list[HolidayCreate],
+    to_update: list[dict],
+) -> list:
+    """
+    Write a whole bulk upload in one transaction.
+
+    New holidays go in as a single multi-row INSERT ... RETURNING; updates are
+    primary-key mappings ({"id", "type", "repeat_yearly"}) applied with one
+    executemany UPDATE. Returns (id, name, date, department) rows for the
+    inserted holidays.
+    """
+    created = []
+    if to_insert:
+        created = db.execute(
+            insert(Holiday).returning(Holiday.id, Holiday.name, Holiday.date, Holiday.department),
+            [item.model_dump() for item in to_insert],
+        ).all()
+        for row in created:
+            _auto_mark_holiday_attendance(
+                db, Holiday(id=row.id, date=row.date, department=row.department)
+            )
+
+    if to_update:
+        db.execute(update(Holiday), to_update)
+
+    if created or to_update:
+        db.commit()
+        invalidate_holiday_date_cache()
+    return created
 
 
 def get_holiday_by_id(db: Session, holiday_id: int) -> Optional[Holiday]:
@@ -127,6 +184,7 @@ def create_holiday(db: Session, data: HolidayCreate) -> Holiday:
     _auto_mark_holiday_attendance(db, holiday)
 
     db.commit()
+    invalidate_holiday_date_cache()
     db.refresh(holiday)
     return holiday
 
@@ -160,6 +218,7 @@ def update_holiday(db: Session, holiday_id: int, data: HolidayUpdate) -> Optiona
         _auto_mark_holiday_attendance(db, holiday)
 
     db.commit()
+    invalidate_holiday_date_cache()
     db.refresh(holiday)
     return holiday
 
@@ -173,6 +232,7 @@ def delete_holiday(db: Session, holiday_id: int) -> bool:
 
     db.delete(holiday)
     db.commit()
+    invalidate_holiday_date_cache()
     return True
 
 
@@ -189,6 +249,24 @@ def get_holidays_for_date(db: Session, target_date: date) -> list[Holiday]:
     return db.query(Holiday).filter(Holiday.date == target_date).all()
 
 
+def get_holiday_payloads_for_date(db: Session, target_date: date) -> list[dict]:
+    """Serialized HolidayOut list for a date, served from a short-lived cache."""
+    payload = _date_cache.get(target_date)
+    if payload is not None:
+        return payload
+
+    payload = [
+        HolidayOut.model_validate(h).model_dump(mode="json")
+        for h in get_holidays_for_date(db, target_date)
+    ]
+    _date_cache.set(target_date, payload)
+    return payload
+
+
+def invalidate_holiday_date_cache() -> None:
+    _date_cache.clear()
+
+
 def get_holidays_for_month(db: Session, year: int, month: int) -> list[Holiday]:
     """Used by attendance history to overlay holiday info on calendar."""
     return (
@@ -1,14 +1,23 @@
-from typing import Iterable, List, Optional
+from threading import Lock
+from typing import Callable, Iterable, List, Optional
+import time
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, extract
+from sqlalchemy import and_, extract, insert
 from datetime import date, timedelta
 
 from app.core.notification_ws_manager import notification_ws_manager
+from app.database.session import SessionLocal
 from app.models.notification import Notification
 from app.models.user import User
 from app.models.holiday import Holiday
 
+# Read endpoints only need the tomorrow-holiday sweep occasionally; holiday
+# writes call ensure_tomorrow_holiday_notifications directly.
+HOLIDAY_REMINDER_INTERVAL_SECONDS = 3600
+_holiday_reminder_lock = Lock()
+_holiday_reminder_state = {"date": None, "checked_at": 0.0}
+
 
 def notification_to_payload(notification: Notification) -> dict:
     return {
@@ -27,6 +36,20 @@ def notification_to_payload(notification: Notification) -> dict:
     }
 
 
+def run_with_new_session(func: Callable, *args, **kwargs):
+    """
+    Run a notification helper on its own session.
+
+    Used for BackgroundTasks: the request session is closed once the response
+    is sent, so deferred fan-outs must open (and close) their own.
+    """
+    db = SessionLocal()
+    try:
+        return func(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
 def push_notification(
     db: Session,
     *,
@@ -70,27 +93,32 @@ def push_notifications(
     if not normalized_ids:
         return []
 
-    notifications = [
-        Notification(
-            user_id=user_id,
-            title=title,
-            message=message,
-            event_type=event_type,
-            reference_type=reference_type,
-            reference_id=reference_id,
-            created_by=created_by,
-            is_read=False,
-        )
-        for user_id in normalized_ids
+    # Single multi-row INSERT ... RETURNING; ids and created_at come back with
+    # it, so no per-row refresh is needed before pushing over the websocket.
+    notifications = db.scalars(
+        insert(Notification).returning(Notification, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": user_id,
+                "title": title,
+                "message": message,
+                "event_type": event_type,
+                "reference_type": reference_type,
+                "reference_id": reference_id,
+                "created_by": created_by,
+                "is_read": False,
+            }
+            for user_id in normalized_ids
+        ],
+    ).all()
+    payloads = [
+        (notification.user_id, notification_to_payload(notification))
+        for notification in notifications
     ]
-    db.add_all(notifications)
     db.commit()
 
-    for notification in notifications:
-        db.refresh(notification)
-        notification_ws_manager.notify_threadsafe(
-            notification.user_id, notification_to_payload(notification)
-        )
+    for user_id, payload in payloads:
+        notification_ws_manager.notify_threadsafe(user_id, payload)
 
     return notifications
 
@@ -147,6 +175,34 @@ def notify_all_admins(
     )
 
 
+def notify_holidays_added(
+    db: Session,
+    *,
+    holidays: Iterable[dict],
+    created_by: Optional[int] = None
+) -> List[Notification]:
+    """Fan out "New holiday added" for several holidays, resolving recipients once."""
+    employee_ids = [
+        user_id
+        for (user_id,) in db.query(User.id).filter(User.role == "employee", User.is_active == True).all()
+    ]
+    notifications: List[Notification] = []
+    for holiday in holidays:
+        notifications.extend(
+            push_notifications(
+                db,
+                user_ids=employee_ids,
+                title="New holiday added",
+                message=f"Holiday declared on {holiday['date']}: {holiday['name']}",
+                event_type="holiday_added",
+                reference_type="holiday",
+                reference_id=holiday["id"],
+                created_by=created_by,
+            )
+        )
+    return notifications
+
+
 def ensure_tomorrow_holiday_notifications(db: Session) -> int:
     tomorrow = date.today() + timedelta(days=1)
     employees = [uid for (uid,) in db.query(User.id).filter(User.role == "employee", User.is_active == True).all()]
@@ -194,3 +250,23 @@ def ensure_tomorrow_holiday_notifications(db: Session) -> int:
     if created_count:
         db.commit()
     return created_count
+
+
+def maybe_ensure_tomorrow_holiday_notifications(db: Session) -> int:
+    """
+    Throttled ensure_tomorrow_holiday_notifications for hot read paths.
+
+    Runs at most once per HOLIDAY_REMINDER_INTERVAL_SECONDS per process, and
+    always on the first call after the date changes.
+    """
+    today = date.today()
+    now = time.monotonic()
+    with _holiday_reminder_lock:
+        if (
+            _holiday_reminder_state["date"] == today
+            and now - _holiday_reminder_state["checked_at"] < HOLIDAY_REMINDER_INTERVAL_SECONDS
+        ):
+            return 0
+        _holiday_reminder_state["date"] = today
+        _holiday_reminder_state["checked_at"] = now
+    return ensure_tomorrow_holiday_notifications(db)
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_time_log import TaskTimeLog
+
+
+def project_load_options():
+    """
+    Loader options for every project query that feeds serialize_project.
+
+    Everything serialize_project and ProjectOut touch is loaded up front, one
+    SELECT per relationship level instead of one per project/task; hours come
+    from get_project_stats. Anything else that would lazy load raises, so a new
+    field can't quietly reintroduce N+1 queries.
+    """
+    return (
+        joinedload(Project.owner),
+        selectinload(Project.team_members),
+        selectinload(Project.tasks).options(
+            # TaskOut.project_name reads task.project, and the parent Project
+            # isn't guaranteed to still be in the identity map by then.
+            joinedload(Task.project),
+            joinedload(Task.assigned_user),
+            joinedload(Task.created_user),
+            raiseload("*", sql_only=True),
+        ),
+        raiseload("*", sql_only=True),
+    )
+
+
+def get_project_stats(db: Session, project_ids: List[int]) -> dict:
+    """Task count, completed count and logged seconds per project in one grouped query."""
+    if not project_ids:
+        return {}
+
+    stats = {pid: {"task_count": 0, "completed_count": 0, "total_seconds": 0} for pid in project_ids}
+
+    # Logged seconds per task first, so joining them to tasks can't inflate the counts.
+    now = datetime.now(timezone.utc)
+    log_end = func.coalesce(TaskTimeLog.end_time, now)
+    task_seconds = select(
+        TaskTimeLog.task_id,
+        func.sum(func.extract("epoch", log_end - TaskTimeLog.start_time)).label("seconds"),
+    ).join(Task, Task.id == TaskTimeLog.task_id).where(
+        Task.project_id.in_(project_ids),
+        log_end > TaskTimeLog.start_time,
+    ).group_by(TaskTimeLog.task_id).subquery()
+
+    rows = db.execute(
+        select(
+            Task.project_id,
+            func.count(Task.id),
+            func.sum(case((Task.status == "completed", 1), else_=0)),
+            func.sum(func.coalesce(task_seconds.c.seconds, 0)),
+        ).outerjoin(task_seconds, task_seconds.c.task_id == Task.id).where(
+            Task.project_id.in_(project_ids)
+        ).group_by(Task.project_id)
+    ).all()
+    for project_id, task_count, completed_count, total_seconds in rows:
+        stats[project_id] = {
+            "task_count": int(task_count or 0),
+            "completed_count": int(completed_count or 0),
+            "total_seconds": int(total_seconds or 0),
+        }
+
+    return stats
+
+
+def serialize_project(project: Project, stats: dict) -> dict:
+    task_count = stats["task_count"]
+    completed_count = stats["completed_count"]
+    project_progress = int(round((completed_count / task_count) * 100)) if task_count else 0
+
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "start_date": project.start_date,
+        "end_date": project.end_date,
+        "status": project.status,
+        "created_by": project.created_by,
+        "owner_id": project.owner_id,
+        "created_at": project.created_at,
+        "owner": project.owner,
+        "team_members": project.team_members or [],
+        "tasks": project.tasks or [],
+        "task_count": task_count,
+        "project_progress": project_progress,
+        "total_hours": round(stats["total_seconds"] / 3600, 1),
+    }
@@ -1,26 +1,88 @@
 from datetime import datetime, time, timezone
+from typing import Optional
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
-from sqlalchemy import inspect, text
+from sqlalchemy import and_, func, inspect, select, text, update
 
+from app.core.attendance_ws_manager import attendance_ws_manager
+from app.core.ttl_cache import TTLCache
 from app.models.task import Task
 from app.models.task_time_log import TaskTimeLog
 from app.services.attendance_service import get_ist_date, get_today_total
 
 MAX_WORK_SECONDS = 9 * 3600  # 9 hours
 
+# /tasks/active is polled by every open dashboard. Its answer only changes
+# when a task or its timer changes, and every such write drops the user's
+# entry; the short TTL bounds staleness for other workers and for attendance
+# auto-close.
+_active_task_cache = TTLCache(ttl_seconds=2, max_entries=10_000)
+# "No running task" is cached as None, so a miss needs its own marker.
+_NOT_CACHED = object()
+
+
+def get_cached_active_task(user_id: int) -> tuple[bool, Optional[dict]]:
+    """Return (hit, payload) for the user's cached /tasks/active answer."""
+    payload = _active_task_cache.get(user_id, _NOT_CACHED)
+    if payload is _NOT_CACHED:
+        return False, None
+    return True, payload
+
+
+def cache_active_task(user_id: int, payload: Optional[dict]) -> None:
+    _active_task_cache.set(user_id, payload)
+
+
+def invalidate_active_task(user_id: Optional[int]) -> None:
+    """Drop the user's cached active task and tell their open tabs to refetch."""
+    if user_id is None:
+        return
+    _active_task_cache.invalidate(user_id)
+    attendance_ws_manager.notify_task_change_threadsafe(user_id)
+
+
+# Set once the column check has passed in this process; the task helpers
+# below call ensure_task_schema on every start/stop/complete, and schema
+# reflection is several catalog round trips per call.
+_task_schema_ready = False
+
 
 def ensure_task_schema(db: Session) -> None:
+    global _task_schema_ready
+    if _task_schema_ready:
+        return
     inspector = inspect(db.bind)
     existing_cols = {c["name"] for c in inspector.get_columns("tasks")}
     if "is_overtime" in existing_cols:
+        _task_schema_ready = True
         return
     try:
         db.execute(text("ALTER TABLE tasks ADD COLUMN is_overtime BOOLEAN DEFAULT FALSE NOT NULL"))
         db.commit()
+        _task_schema_ready = True
     except Exception:
         db.rollback()
 
 
+def close_duplicate_running_logs(conn: Connection) -> int:
+    """
+    Close every open task log except each user's newest one, ending it where
+    the newest one starts. The unique running-timer index cannot be built
+    while duplicates exist. Returns the number of logs closed.
+    """
+    logs = TaskTimeLog.__table__
+    other = logs.alias("other")
+    user_open = and_(other.c.user_id == logs.c.user_id, other.c.end_time.is_(None))
+    newest_id = select(func.max(other.c.id)).where(user_open).scalar_subquery()
+    newest_start = select(func.max(other.c.start_time)).where(user_open).scalar_subquery()
+    result = conn.execute(
+        update(logs)
+        .where(logs.c.end_time.is_(None), logs.c.id != newest_id)
+        .values(end_time=newest_start)
+    )
+    return result.rowcount or 0
+
+
 def get_daily_summary(user_id: int, db: Session):
     """
     Returns:
@@ -30,12 +92,13 @@ def get_daily_summary(user_id: int, db: Session):
         - overtime
     """
 
-    today = get_ist_date()
+    now = datetime.now(timezone.utc)
+    today = get_ist_date(now)
 
     # -------------------------
     # 1️⃣ Attendance Total
     # -------------------------
-    attendance_total = get_today_total(user_id, db)
+    attendance_total = get_today_total(user_id, db, now)
 
     # -------------------------
     # 2️⃣ Task Time Total
@@ -97,14 +160,6 @@ def set_task_paused(task: Task, db: Session) -> None:
     db.add(task)
 
 
-def set_task_completed(task: Task, completed_by: int, db: Session) -> None:
-    ensure_task_schema(db)
-    task.status = "completed"
-    task.completed_at = datetime.now(timezone.utc)
-    task.completed_by = completed_by
-    db.add(task)
-
-
 def apply_overtime_status_if_needed(task: Task, db: Session) -> None:
     ensure_task_schema(db)
     if not task.estimated_hours:
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Settings are read when app.config is first imported, so these must be in
+# place before any app module loads.
+_db_file = os.path.join(tempfile.mkdtemp(prefix="hr_tests_"), "test.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_file}")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("SMTP_HOST", "localhost")
+os.environ.setdefault("SMTP_PORT", "25")
+os.environ.setdefault("SMTP_USERNAME", "test")
+os.environ.setdefault("SMTP_PASSWORD", "test")
+os.environ.setdefault("SMTP_FROM_EMAIL", "noreply@example.com")
+os.environ.setdefault("FRONTEND_LOGIN_URL", "http://localhost/login")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+# main.py mounts uploads/ relative to the working directory.
+os.chdir(BACKEND_DIR)
+
+from app.database.base import Base  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import app as fastapi_app  # noqa: E402  (imports every model)
+from app.core.dependencies import get_current_admin, get_current_user  # noqa: E402
+from app.database.session import get_db  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@pytest.fixture()
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def acting_users():
+    """
+    Who the client is signed in as: {"admin_id": ..., "user_id": ...}.
+    Test modules override this with ids from their own seed data; a missing
+    key leaves that dependency on the real token check.
+    """
+    return {}
+
+
+@pytest.fixture()
+def client(db, acting_users):
+    def _get_db():
+        yield db
+
+    fastapi_app.dependency_overrides[get_db] = _get_db
+    if "admin_id" in acting_users:
+        fastapi_app.dependency_overrides[get_current_admin] = lambda: db.get(User, acting_users["admin_id"])
+    if "user_id" in acting_users:
+        fastapi_app.dependency_overrides[get_current_user] = lambda: db.get(User, acting_users["user_id"])
+    try:
+        yield TestClient(fastapi_app)
+    finally:
+        fastapi_app.dependency_overrides.clear()
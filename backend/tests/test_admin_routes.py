@@ -0,0 +1,42 @@
+import pytest
+
+from app.models.user import User
+
+
+@pytest.fixture()
+def acting_users(db):
+    # ADMIN-0002 was demoted, so counting admins would hand out a taken ID.
+    db.add_all([
+        User(name="Root", email="root@example.com", employee_id="ADMIN-0001", password_hash="x", role="admin"),
+        User(name="Former", email="former@example.com", employee_id="ADMIN-0002", password_hash="x", role="employee"),
+    ])
+    db.commit()
+    return {"admin_id": db.query(User.id).filter(User.email == "root@example.com").scalar()}
+
+
+def test_create_admin_numbers_after_highest_existing_id(client):
+    res = client.post("/admin/create", json={"name": "New", "email": "new@example.com", "password": "secret123"})
+    assert res.status_code == 200, res.text
+    assert res.json()["admin"]["employee_id"] == "ADMIN-0003"
+
+    res = client.post("/admin/create", json={"name": "Next", "email": "next@example.com", "password": "secret123"})
+    assert res.status_code == 200, res.text
+    assert res.json()["admin"]["employee_id"] == "ADMIN-0004"
+
+
+def test_create_admin_rejects_duplicate_email(client):
+    res = client.post("/admin/create", json={"name": "Dup", "email": "root@example.com", "password": "secret123"})
+    assert res.status_code == 400
+
+
+def test_create_admin_compares_id_suffixes_numerically(client, db):
+    db.add_all([
+        User(name="Old", email="old@example.com", employee_id="ADMIN-9999", password_hash="x", role="admin"),
+        User(name="Big", email="big@example.com", employee_id="ADMIN-10000", password_hash="x", role="admin"),
+        User(name="Odd", email="odd@example.com", employee_id="ADMIN-ops", password_hash="x", role="admin"),
+    ])
+    db.commit()
+
+    res = client.post("/admin/create", json={"name": "New", "email": "new@example.com", "password": "secret123"})
+    assert res.status_code == 200, res.text
+    assert res.json()["admin"]["employee_id"] == "ADMIN-10001"
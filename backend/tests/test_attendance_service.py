@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.attendance import Attendance
+from app.models.user import User
+from app.services.attendance_service import clock_in
+
+
+def test_clock_in_response_includes_every_column(db):
+    user = User(name="Employee", email="employee@example.com", employee_id="EMP1", password_hash="x", role="employee")
+    db.add(user)
+    db.commit()
+
+    # 09:00 IST on a Monday: no holiday, leave or break in the way.
+    attendance = clock_in(user, db, datetime(2026, 3, 2, 3, 30, tzinfo=timezone.utc))
+
+    # The row is committed without a refresh, so the response must already
+    # carry every column, NULL ones included.
+    body = jsonable_encoder(attendance)
+    assert set(body) >= {column.key for column in Attendance.__table__.columns}
+    assert body["clock_out_time"] is None
+    assert body["status"] == "present"
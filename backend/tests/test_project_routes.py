@@ -0,0 +1,92 @@
+from datetime import date
+
+import pytest
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+
+@pytest.fixture()
+def populated(db):
+    admin = User(name="Admin", email="admin@example.com", password_hash="x", role="admin")
+    owner = User(name="Owner", email="owner@example.com", employee_id="EMP1", password_hash="x", role="employee")
+    member = User(name="Member", email="member@example.com", employee_id="EMP2", password_hash="x", role="employee")
+    db.add_all([admin, owner, member])
+    db.flush()
+
+    project = Project(
+        name="Apollo",
+        description="Launch",
+        start_date=date(2026, 1, 1),
+        status="active",
+        created_by=admin.id,
+        owner_id=owner.id,
+        team_members=[owner, member],
+    )
+    db.add(project)
+    db.flush()
+    db.add_all([
+        Task(title="Design", project_id=project.id, assigned_to=member.id, created_by=admin.id),
+        Task(title="Build", project_id=project.id, assigned_to=owner.id, created_by=admin.id, status="completed"),
+    ])
+    db.commit()
+    return {"admin_id": admin.id, "owner_id": owner.id, "member_id": member.id, "project_id": project.id}
+
+
+@pytest.fixture()
+def acting_users(populated):
+    return {"admin_id": populated["admin_id"], "user_id": populated["owner_id"]}
+
+
+def _assert_project(body):
+    assert body["name"] == "Apollo"
+    assert body["owner"]["name"] == "Owner"
+    assert {m["name"] for m in body["team_members"]} == {"Owner", "Member"}
+    assert {t["project_name"] for t in body["tasks"]} == {"Apollo"}
+    assert {t["assignee_name"] for t in body["tasks"]} == {"Owner", "Member"}
+    assert body["task_count"] == 2
+    assert body["project_progress"] == 50
+
+
+# The project loaders end in raiseload("*", sql_only=True); serializing a
+# populated project through each endpoint proves every field ProjectOut and
+# TaskOut read is eager loaded.
+def test_admin_project_list(client):
+    response = client.get("/admin/projects/")
+    assert response.status_code == 200, response.text
+    _assert_project(response.json()[0])
+
+
+def test_admin_project_detail(client, populated):
+    response = client.get(f"/admin/projects/{populated['project_id']}")
+    assert response.status_code == 200, response.text
+    _assert_project(response.json())
+
+
+def test_admin_project_update(client, populated):
+    response = client.put(
+        f"/admin/projects/{populated['project_id']}",
+        json={
+            "name": "Apollo",
+            "description": "Launch",
+            "start_date": "2026-01-01",
+            "end_date": "2026-06-30",
+            "owner_id": populated["owner_id"],
+            "team_members": [populated["owner_id"], populated["member_id"]],
+        },
+    )
+    assert response.status_code == 200, response.text
+    _assert_project(response.json())
+
+
+def test_my_projects(client):
+    response = client.get("/projects/my")
+    assert response.status_code == 200, response.text
+    _assert_project(response.json()[0])
+
+
+def test_my_project_detail(client, populated):
+    response = client.get(f"/projects/my/{populated['project_id']}")
+    assert response.status_code == 200, response.text
+    _assert_project(response.json())
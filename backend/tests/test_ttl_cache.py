@@ -0,0 +1,29 @@
+from app.core import ttl_cache
+from app.core.ttl_cache import TTLCache
+
+
+def test_get_respects_version_and_invalidation():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    cache.set((1, 7), "body", version=3)
+
+    assert cache.get((1, 7), version=3) == "body"
+    assert cache.get((1, 7), version=4) is None
+
+    cache.invalidate_where(lambda key: key[1] == 7)
+    assert cache.get((1, 7), version=3) is None
+
+
+def test_entries_expire_and_full_cache_is_cleared(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(ttl_cache, "monotonic", lambda: clock[0])
+    cache = TTLCache(ttl_seconds=2, max_entries=2)
+
+    cache.set("a", None)
+    assert cache.get("a", "miss") is None
+    clock[0] += 3
+    assert cache.get("a", "miss") == "miss"
+
+    cache.set("b", 1)
+    cache.set("c", 2)
+    assert cache.get("b") is None
+    assert cache.get("c") == 2
@@ -572,30 +572,28 @@ function renderExcel(data) {
         numberCell.className = "row-number-cell";
         tr.appendChild(numberCell);
 
-        // Index cells by column_id for correct alignment
-        const cellByColId = {};
-        row.cells.forEach(c => { cellByColId[c.column_id] = c; });
+        // cell_ids / values are aligned with data.columns by index
+        data.columns.forEach((col, index) => {
+            const cellId = row.cell_ids[index];
+            const value  = row.values[index];
+            const td     = document.createElement("td");
 
-        data.columns.forEach(col => {
-            const cell = cellByColId[col.id];
-            const td   = document.createElement("td");
-
-            if (!cell) {
+            if (cellId == null) {
                 tr.appendChild(td);
                 return;
             }
 
-            const canEdit = isAdmin() ? true : !!cell.can_edit;
+            const canEdit = isAdmin() ? true : !!col.can_edit;
 
             if (canEdit) {
                 td.contentEditable = "true";
-                td.textContent = cell.value || "";
+                td.textContent = value || "";
                 td.onblur = async () => {
-                    await updateCell(cell.cell_id, td.textContent);
+                    await updateCell(cellId, td.textContent);
                 };
             } else {
                 td.contentEditable = "false";
-                td.textContent = cell.value || "";
+                td.textContent = value || "";
                 td.classList.add("readonly-cell");
             }
 
@@ -150,6 +150,13 @@ function initTrackerElements() {
         if (data.type === "attendance_update") {
           await syncAttendance();
           updateUI();
+        } else if (data.type === "task_update") {
+          // The timer may have changed in another tab; restart from the server's numbers.
+          if (taskInterval) {
+            clearInterval(taskInterval);
+            taskInterval = null;
+          }
+          await loadState();
         }
       } catch (error) {
         console.error("Attendance socket message error:", error);
@@ -295,7 +302,10 @@ function initTrackerElements() {
           const startTime = new Date(activeTask.start_time).getTime();
           const now = new Date().getTime();
           const runningSeconds = Math.floor((now - startTime) / 1000);
-          const totalSeconds = activeTask.total_seconds || runningSeconds;
+          // completed_seconds stays valid when the browser revalidates a cached response (304).
+          const totalSeconds = typeof activeTask.completed_seconds === "number"
+            ? activeTask.completed_seconds + runningSeconds
+            : (activeTask.total_seconds || runningSeconds);
           taskSeconds = Math.max(totalSeconds, runningSeconds);
 
           if (!taskInterval) {